@@ -0,0 +1,302 @@
+# app/adk/agent_cache.py - Exact and semantic caching of agent LLM responses
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from app.config.adk_config import ADK_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are deleted from SQLite at most this often, on the next store
+PURGE_INTERVAL_SECONDS = 300
+
+class _EmbeddingIndex:
+    """Unit-normalized prompt embeddings of one agent, with the creation time of each.
+
+    Rows live in preallocated arrays that double when full, so adding an entry is
+    amortized O(1) instead of copying the whole matrix.
+    """
+
+    def __init__(self, keys: List[str], created: np.ndarray, matrix: np.ndarray):
+        self._keys = list(keys)
+        self._positions = {key: row for row, key in enumerate(self._keys)}
+        self._created = created.astype(np.float64)
+        self._matrix = matrix.astype(np.float32, copy=False)
+        self._size = len(self._keys)
+
+    def add(self, key: str, created_at: float, embedding: np.ndarray) -> None:
+        row = self._positions.get(key)
+        if row is None:
+            if self._size == 0 and self._matrix.shape[1] != embedding.shape[0]:
+                self._matrix = np.empty((16, embedding.shape[0]), dtype=np.float32)
+                self._created = np.empty(16, dtype=np.float64)
+            elif self._size == len(self._matrix):
+                capacity = max(16, 2 * self._size)
+                self._matrix = np.resize(self._matrix, (capacity, self._matrix.shape[1]))
+                self._created = np.resize(self._created, capacity)
+            row = self._size
+            self._size += 1
+            self._keys.append(key)
+            self._positions[key] = row
+        self._matrix[row] = embedding
+        self._created[row] = created_at
+
+    def prune(self, cutoff: float) -> None:
+        """Drop rows created before ``cutoff``."""
+        live = self._created[:self._size] >= cutoff
+        if live.all():
+            return
+        self._keys = [key for key, keep in zip(self._keys, live) if keep]
+        self._positions = {key: row for row, key in enumerate(self._keys)}
+        self._size = len(self._keys)
+        self._matrix[:self._size] = self._matrix[:len(live)][live]
+        self._created[:self._size] = self._created[:len(live)][live]
+
+    def matches(self, embedding: np.ndarray, threshold: float, limit: int) -> List[str]:
+        """Keys of up to ``limit`` rows whose cosine similarity reaches ``threshold``, best first."""
+        if not self._size:
+            return []
+        # Rows are unit-normalized, so the dot product is the cosine similarity
+        scores = self._matrix[:self._size] @ embedding
+        above = np.flatnonzero(scores >= threshold)
+        best = above[np.argsort(scores[above])[::-1][:limit]]
+        return [self._keys[row] for row in best]
+
+class AgentResponseCache:
+    """Two-tier cache of agent responses keyed on the formatted agent prompt.
+
+    Tier one is an exact match on md5(agent, model, prompt), served from a bounded in-memory
+    LRU and backed by SQLite so entries survive restarts. Tier two, when enabled, embeds
+    the prompt and reuses the most similar cached response of the same agent whose
+    cosine similarity reaches ``similarity_threshold``. Agents in ``exact_only_agents``
+    never use the semantic tier.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float, agent_ttl_seconds: Dict[str, float],
+                 exact_only_agents: Iterable[str], semantic_enabled: bool,
+                 similarity_threshold: float, embedding_model: str, memory_size: int = 1024,
+                 pending_size: int = 256):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.agent_ttl_seconds = agent_ttl_seconds
+        self.exact_only_agents = frozenset(exact_only_agents)
+        self.semantic_enabled = semantic_enabled
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self.memory_size = memory_size
+        self.pending_size = pending_size
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._vectors: Dict[str, _EmbeddingIndex] = {}
+        # Embeddings of missed prompts, held until ``set`` or ``discard``; bounded in case
+        # a caller does neither
+        self._pending_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embedder = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    @staticmethod
+    def make_key(agent_name: str, prompt: str, model: str = "") -> str:
+        # The model is part of the key so switching models never serves stale answers
+        return hashlib.md5(f"{agent_name}\0{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _ttl(self, agent_name: str) -> float:
+        return self.agent_ttl_seconds.get(agent_name, self.ttl_seconds)
+
+    def _uses_semantic_tier(self, agent_name: str) -> bool:
+        return self.semantic_enabled and agent_name not in self.exact_only_agents
+
+    async def get(self, agent_name: str, prompt: str, model: str = "") -> Optional[Dict[str, Any]]:
+        """Return a cached response for this prompt, or None on a miss."""
+        key = self.make_key(agent_name, prompt, model)
+        cutoff = time.time() - self._ttl(agent_name)
+
+        response = await self._get_exact(key, cutoff)
+        if response is not None or not self._uses_semantic_tier(agent_name):
+            return response
+
+        embedding = await self._embed(prompt)
+        if embedding is None:
+            return None
+
+        response = None
+        for match_key in await self._nearest(agent_name, embedding, cutoff):
+            response = await self._get_exact(match_key, cutoff)
+            if response is not None:
+                break
+        if response is None:
+            # A miss is followed by ``set`` (or ``discard``), which takes the embedding
+            self._pending_embeddings[key] = embedding
+            while len(self._pending_embeddings) > self.pending_size:
+                self._pending_embeddings.popitem(last=False)
+        return response
+
+    def discard(self, agent_name: str, prompt: str, model: str = "") -> None:
+        """Forget the embedding of a missed prompt whose response will not be stored."""
+        self._pending_embeddings.pop(self.make_key(agent_name, prompt, model), None)
+
+    async def set(self, agent_name: str, prompt: str, response: Dict[str, Any], model: str = "") -> None:
+        """Store a response; reuses the embedding computed by a preceding miss."""
+        key = self.make_key(agent_name, prompt, model)
+        embedding = self._pending_embeddings.pop(key, None)
+        created_at = time.time()
+
+        # tool_results repeats the payloads of function_responses; store them once and
+        # rebuild the index on load
+        stored = {field: value for field, value in response.items() if field != "tool_results"}
+        try:
+            body = orjson.dumps(stored, default=str)
+        except TypeError as e:
+            logger.warning("⚠️  Agent response for %s is not cacheable: %s", agent_name, e)
+            return
+
+        self._remember(key, created_at, response)
+        if embedding is not None and agent_name in self._vectors:
+            self._vectors[agent_name].add(key, created_at, embedding)
+
+        try:
+            await asyncio.to_thread(self._store, key, agent_name, created_at, body, embedding)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("⚠️  Failed to persist agent cache entry: %s", e)
+
+    def _remember(self, key: str, created_at: float, response: Dict[str, Any]) -> None:
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    async def _get_exact(self, key: str, cutoff: float) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                entry = await asyncio.to_thread(self._load, key)
+            except (sqlite3.Error, OSError, orjson.JSONDecodeError) as e:
+                logger.warning("⚠️  Ignoring unreadable agent cache entry %s: %s", key, e)
+                return None
+            if entry is None:
+                return None
+            self._remember(key, *entry)
+        else:
+            self._memory.move_to_end(key)
+
+        created_at, response = entry
+        return response if created_at >= cutoff else None
+
+    async def _nearest(self, agent_name: str, embedding: np.ndarray, cutoff: float,
+                       limit: int = 3) -> List[str]:
+        """Return the keys of the most similar unexpired prompts above the threshold."""
+        index = self._vectors.get(agent_name)
+        if index is None:
+            try:
+                index = self._vectors[agent_name] = await asyncio.to_thread(self._load_vectors, agent_name)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("⚠️  Failed to load agent cache embeddings: %s", e)
+                return []
+
+        index.prune(cutoff)
+        return index.matches(embedding, self.similarity_threshold, limit)
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            if self._embedder is None:
+                from vertexai.language_models import TextEmbeddingModel
+                self._embedder = await asyncio.to_thread(TextEmbeddingModel.from_pretrained, self.embedding_model)
+            [embedding] = await self._embedder.get_embeddings_async([text])
+        except Exception as e:
+            logger.warning("⚠️  Prompt embedding failed, skipping semantic cache: %s", e)
+            return None
+
+        vector = np.asarray(embedding.values, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    # SQLite access; these run in worker threads
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS agent_responses ("
+                "key TEXT PRIMARY KEY, agent TEXT NOT NULL, created_at REAL NOT NULL, "
+                "response BLOB NOT NULL, embedding BLOB)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_responses_agent ON agent_responses (agent)")
+            self._conn = conn
+        return self._conn
+
+    def _load(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT created_at, response FROM agent_responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        response = orjson.loads(row[1])
+        if "tool_results" not in response:
+            response["tool_results"] = {
+                call["name"]: call["response"] for call in response.get("function_responses", [])
+            }
+        return row[0], response
+
+    def _store(self, key: str, agent_name: str, created_at: float, body: bytes,
+               embedding: Optional[np.ndarray]) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO agent_responses (key, agent, created_at, response, embedding) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, agent_name, created_at, body, embedding.tobytes() if embedding is not None else None),
+            )
+            if created_at - self._last_purge >= PURGE_INTERVAL_SECONDS:
+                self._purge_expired(conn, created_at)
+                self._last_purge = created_at
+            conn.commit()
+
+    def _purge_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete rows past their agent's TTL; the database sits on memory-backed /tmp."""
+        overrides = list(self.agent_ttl_seconds.items())
+        for agent_name, ttl in overrides:
+            conn.execute("DELETE FROM agent_responses WHERE agent = ? AND created_at < ?",
+                         (agent_name, now - ttl))
+        placeholders = ", ".join("?" * len(overrides))
+        conn.execute(
+            f"DELETE FROM agent_responses WHERE created_at < ? AND agent NOT IN ({placeholders})",
+            (now - self.ttl_seconds, *(agent_name for agent_name, _ in overrides)),
+        )
+
+    def _load_vectors(self, agent_name: str) -> _EmbeddingIndex:
+        cutoff = time.time() - self._ttl(agent_name)
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT key, created_at, embedding FROM agent_responses "
+                "WHERE agent = ? AND embedding IS NOT NULL AND created_at >= ?",
+                (agent_name, cutoff),
+            ).fetchall()
+        if not rows:
+            return _EmbeddingIndex([], np.empty(0), np.empty((0, 0), dtype=np.float32))
+        keys = [row[0] for row in rows]
+        created = np.array([row[1] for row in rows], dtype=np.float64)
+        matrix = np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows])
+        return _EmbeddingIndex(keys, created, matrix)
+
+# Global cache instance
+agent_cache = AgentResponseCache(
+    db_path=ADK_CONFIG["agent_cache_path"],
+    ttl_seconds=ADK_CONFIG["agent_cache_ttl_seconds"],
+    agent_ttl_seconds={"context": ADK_CONFIG["agent_cache_context_ttl_seconds"]},
+    exact_only_agents=("context",),
+    semantic_enabled=ADK_CONFIG["agent_cache_semantic"],
+    similarity_threshold=ADK_CONFIG["agent_cache_similarity_threshold"],
+    embedding_model=ADK_CONFIG["agent_cache_embedding_model"],
+)
@@ -1,6 +1,5 @@
 # app/adk/agents/model_integration.py - ADK Model Integration for Enhanced Processing
 import asyncio
-import json
 import re
 from typing import Dict, Any, List, Optional
 from google.adk.sessions import InMemorySessionService
@@ -0,0 +1,103 @@
+# app/adk/jobs.py - In-process progress tracking for background hypothesis runs
+import asyncio
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Set, TypeVar
+
+TERMINAL_STATES = ("complete", "failed")
+
+T = TypeVar("T")
+
+class JobTracker:
+    """Fan out pipeline progress events to any number of stream subscribers.
+
+    Events are kept per job so a client that connects late still sees the full history.
+    Finished jobs are dropped after ``retention_seconds``.
+    """
+
+    def __init__(self, retention_seconds: float = 600):
+        self.retention_seconds = retention_seconds
+        self._events: Dict[int, List[Dict[str, Any]]] = {}
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+
+    def create(self, job_id: int) -> None:
+        """Register a new job."""
+        self._events[job_id] = []
+        self._subscribers[job_id] = set()
+
+    def has_job(self, job_id: int) -> bool:
+        return job_id in self._events
+
+    def publish(self, job_id: int, state: str, **payload: Any) -> None:
+        """Record a state change and push it to every live subscriber."""
+        if job_id not in self._events:
+            return
+
+        event = {"hypothesis_id": job_id, "state": state, **payload}
+        self._events[job_id].append(event)
+        for queue in self._subscribers[job_id]:
+            queue.put_nowait(event)
+
+        if state in TERMINAL_STATES:
+            asyncio.get_running_loop().call_later(self.retention_seconds, self._forget, job_id)
+
+    async def subscribe(self, job_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Yield past and future events for a job until it reaches a terminal state."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self._events.get(job_id, []):
+            queue.put_nowait(event)
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.add(queue)
+
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["state"] in TERMINAL_STATES:
+                    break
+        finally:
+            if subscribers is not None:
+                subscribers.discard(queue)
+
+    def _forget(self, job_id: int) -> None:
+        self._events.pop(job_id, None)
+        self._subscribers.pop(job_id, None)
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto one in-flight run.
+
+    The first caller runs ``func``; callers arriving before it finishes await the same
+    future instead of starting their own run. Everything happens on the event loop
+    thread and there is no await between lookup and insert, so no lock is needed.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def is_inflight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is not None:
+            # Shield so one cancelled follower does not cancel the shared run
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved; followers still receive it
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+# Global tracker instance
+job_tracker = JobTracker()
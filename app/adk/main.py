@@ -1,18 +1,74 @@
 # app/adk/main.py - Updated with minor fixes
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
 import asyncio
+import logging
+import orjson
 import os 
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
 
+from app.adk.jobs import job_tracker, SingleFlight
 from app.adk.orchestrator import orchestrator
-from app.database.database import get_db
+from app.adk.result_cache import result_cache
+from app.adk.schemas import ProcessRequest, ProcessResponse
+from app.config.adk_config import ADK_CONFIG
+from app.config.logging_config import setup_logging
+from app.database.database import get_db, SessionLocal
 from app.database.crud import HypothesisCRUD, ContradictionCRUD, ConfirmationCRUD, AlertCRUD, DashboardCRUD
+from app.database.models import HypothesisStatus
+from app.services.dashboard_cache import dashboard_cache
+from app.utils.profiling import await_timings, timed, timed_await, start_profiler, stop_profiler
 from app.utils.text_processor import ResponseProcessor
 
-app = FastAPI(title="TradeSage AI - ADK Version", version="2.0.0")
+logger = logging.getLogger(__name__)
+
+# How often a progress stream re-reads the row of a job this process is not running
+STATE_POLL_SECONDS = 2.0
+
+def _fail_stale_hypotheses() -> int:
+    """Fail hypotheses whose pipeline died with an earlier process and will never finish."""
+    db = SessionLocal()
+    try:
+        older_than = datetime.utcnow() - timedelta(seconds=ADK_CONFIG["stale_processing_seconds"])
+        return HypothesisCRUD.fail_stale_processing(db, older_than)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up logging, the optional profiler and warm orchestrator clients once per worker."""
+    log_listener = setup_logging()
+    start_profiler()
+    try:
+        stale = await asyncio.to_thread(_fail_stale_hypotheses)
+        if stale:
+            logger.warning("⚠️  Marked %d abandoned hypotheses as failed", stale)
+            await dashboard_cache.invalidate()
+    except Exception as e:
+        logger.warning("⚠️  Could not fail abandoned hypotheses: %s", e)
+    if orchestrator is not None:
+        await orchestrator.warmup()
+    try:
+        yield
+    finally:
+        if orchestrator is not None:
+            await orchestrator.aclose()
+        stop_profiler()
+        await dashboard_cache.aclose()
+        log_listener.stop()
+
+app = FastAPI(
+    title="TradeSage AI - ADK Version",
+    version="2.0.0",
+    default_response_class=ORJSONResponse,  # orjson serializes datetimes natively
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +78,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added after CORS so it wraps it; also sets Vary: Accept-Encoding on compressed responses
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 @app.get("/")
 async def root():
     return {"message": "TradeSage AI - Google ADK v1.0.0 Implementation"}
@@ -30,109 +89,112 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "tradesage-ai-adk", "version": "2.0.0"}
 
-@app.post("/process")
-async def process_hypothesis_adk(request_data: dict, db: Session = Depends(get_db)):
-    """Process trading hypothesis using ADK agents."""
+@app.get("/debug/stats")
+async def debug_stats():
+    """Recent await timings per endpoint and pipeline stage, in milliseconds."""
+    return {"status": "success", "timings": await_timings.stats()}
+
+# Database field limits for agent output
+FINDING_TEXT_LIMIT = 500
+ALERT_TYPE_LIMIT = 50
+ALERT_MESSAGE_LIMIT = 1000
+VALID_ALERT_PRIORITIES = frozenset(("high", "medium", "low"))
+
+def _truncate_column(values: List[Any], limit: int) -> List[Any]:
+    """Truncate a whole column of strings in one pass, reusing strings already within the limit."""
+    return [v[:limit] if isinstance(v, str) and len(v) > limit else v for v in values]
+
+def _finding_columns(findings: List[Any], default_reason: str) -> List[tuple]:
+    """Split findings into truncated quote/reason/source columns and zip them back into rows."""
+    findings = [f for f in findings if isinstance(f, dict)]
+    quotes = _truncate_column([f.get("quote", "") for f in findings], FINDING_TEXT_LIMIT)
+    reasons = _truncate_column([f.get("reason", default_reason) for f in findings], FINDING_TEXT_LIMIT)
+    sources = _truncate_column([f.get("source", "Agent Analysis") for f in findings], FINDING_TEXT_LIMIT)
+    return list(zip(findings, quotes, reasons, sources))
+
+def _insert_rows(db: Session, bulk_create: Callable, create: Callable, rows: List[Dict[str, Any]], label: str) -> List[Dict[str, Any]]:
+    """Insert rows in one statement, falling back to row by row so one bad row doesn't drop the rest.
+
+    Returns the rows that were saved.
+    """
+    if not rows:
+        return rows
+    try:
+        bulk_create(db, rows)
+        return rows
+    except Exception as e:
+        db.rollback()
+        logger.warning("⚠️  Bulk insert of %s rows failed, retrying one by one: %s", label, e)
     
+    saved = []
+    for row in rows:
+        try:
+            create(db, row)
+            saved.append(row)
+        except Exception as e:
+            db.rollback()
+            logger.warning("⚠️  Failed to save %s: %s", label, e)
+    return saved
+
+def _save_pipeline_result(hypothesis_id: int, hypothesis: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Persist orchestrator output for a pending hypothesis and build the API payload."""
+    db = SessionLocal()
     try:
-        # Extract input
-        hypothesis = request_data.get("hypothesis", "")
-        mode = request_data.get("mode", "analyze")
-        
-        if not hypothesis:
-            raise HTTPException(status_code=400, detail="Missing hypothesis")
-        
-        print(f"🚀 Processing with ADK: {hypothesis}")
-        
-        # Process through ADK orchestrator
-        result = await orchestrator.process_hypothesis({
-            "hypothesis": hypothesis,
-            "mode": mode
-        })
-        
-        if result.get("status") == "error":
-            raise HTTPException(status_code=500, detail=result.get("error"))
-        
         # Clean and save to database
         clean_title = ResponseProcessor.clean_hypothesis_title(
             result.get("processed_hypothesis", hypothesis)
         )
         
-        # Create hypothesis in database
-        hypothesis_data = {
-            "title": clean_title,
-            "description": hypothesis,
-            "thesis": result.get("processed_hypothesis", hypothesis),
-            "confidence_score": result.get("confidence_score", 0.5),
-            "status": "active",
-            "created_at": datetime.utcnow(),
-            "instruments": ["SPY"]  # Extract from context in production
-        }
-        
-        db_hypothesis = HypothesisCRUD.create_hypothesis(db, hypothesis_data)
-        
         # Save contradictions with validation
-        cleaned_contradictions = []
-        for contradiction in result.get("contradictions", []):
-            if isinstance(contradiction, dict):
-                try:
-                    # Ensure database field limits
-                    contradiction_data = {
-                        "hypothesis_id": db_hypothesis.id,
-                        "quote": contradiction.get("quote", "")[:500],
-                        "reason": contradiction.get("reason", "Market analysis challenges this thesis")[:500],
-                        "source": contradiction.get("source", "Agent Analysis")[:500],
-                        "strength": contradiction.get("strength", "Medium")
-                    }
-                    ContradictionCRUD.create_contradiction(db, contradiction_data)
-                    cleaned_contradictions.append(contradiction.get("quote", ""))
-                except Exception as e:
-                    print(f"⚠️  Failed to save contradiction: {str(e)}")
-                    continue
+        contradiction_rows = [
+            {"hypothesis_id": hypothesis_id, "quote": quote, "reason": reason, "source": source,
+             "strength": contradiction.get("strength", "Medium")}
+            for contradiction, quote, reason, source
+            in _finding_columns(result.get("contradictions", []), "Market analysis challenges this thesis")
+        ]
+        contradiction_rows = _insert_rows(
+            db, ContradictionCRUD.create_contradictions, ContradictionCRUD.create_contradiction,
+            contradiction_rows, "contradiction",
+        )
+        cleaned_contradictions = list(map(itemgetter("quote"), contradiction_rows))
         
         # Save confirmations with validation
-        cleaned_confirmations = []
-        for confirmation in result.get("confirmations", []):
-            if isinstance(confirmation, dict):
-                try:
-                    # Ensure database field limits
-                    confirmation_data = {
-                        "hypothesis_id": db_hypothesis.id,
-                        "quote": confirmation.get("quote", "")[:500],
-                        "reason": confirmation.get("reason", "Market analysis supports this thesis")[:500],
-                        "source": confirmation.get("source", "Agent Analysis")[:500],
-                        "strength": confirmation.get("strength", "Strong")
-                    }
-                    ConfirmationCRUD.create_confirmation(db, confirmation_data)
-                    cleaned_confirmations.append(confirmation.get("quote", ""))
-                except Exception as e:
-                    print(f"⚠️  Failed to save confirmation: {str(e)}")
-                    continue
+        confirmation_rows = [
+            {"hypothesis_id": hypothesis_id, "quote": quote, "reason": reason, "source": source,
+             "strength": confirmation.get("strength", "Strong")}
+            for confirmation, quote, reason, source
+            in _finding_columns(result.get("confirmations", []), "Market analysis supports this thesis")
+        ]
+        confirmation_rows = _insert_rows(
+            db, ConfirmationCRUD.create_confirmations, ConfirmationCRUD.create_confirmation,
+            confirmation_rows, "confirmation",
+        )
+        cleaned_confirmations = list(map(itemgetter("quote"), confirmation_rows))
         
         # Save alerts with validation
-        for alert in result.get("alerts", []):
-            if isinstance(alert, dict):
-                try:
-                    alert_data = {
-                        "hypothesis_id": db_hypothesis.id,
-                        "alert_type": alert.get("type", "recommendation")[:50],  # Enforce limit
-                        "message": alert.get("message", "")[:1000],  # Enforce limit (adjust based on your schema)
-                        "priority": alert.get("priority", "medium")
-                    }
-                    # Validate priority
-                    if alert_data["priority"] not in ["high", "medium", "low"]:
-                        alert_data["priority"] = "medium"
-                    
-                    AlertCRUD.create_alert(db, alert_data)
-                except Exception as e:
-                    print(f"⚠️  Failed to save alert: {str(e)}")
-                    continue
+        alerts = [a for a in result.get("alerts", []) if isinstance(a, dict)]
+        alert_types = _truncate_column([a.get("type", "recommendation") for a in alerts], ALERT_TYPE_LIMIT)
+        alert_messages = _truncate_column([a.get("message", "") for a in alerts], ALERT_MESSAGE_LIMIT)
+        alert_rows = [
+            {"hypothesis_id": hypothesis_id, "alert_type": alert_type, "message": message,
+             "priority": priority if (priority := alert.get("priority", "medium")) in VALID_ALERT_PRIORITIES else "medium"}
+            for alert, alert_type, message in zip(alerts, alert_types, alert_messages)
+        ]
+        _insert_rows(db, AlertCRUD.create_alerts, AlertCRUD.create_alert, alert_rows, "alert")
+        
+        # Activate last so updated_at (the dashboard version token) moves after all child rows exist
+        HypothesisCRUD.update_hypothesis(db, hypothesis_id, {
+            "title": clean_title,
+            "thesis": result.get("processed_hypothesis", hypothesis),
+            "confidence_score": result.get("confidence_score", 0.5),
+            "status": HypothesisStatus.ACTIVE,
+        })
         
         # Return response with both contradictions AND confirmations
         return {
             "status": "success",
             "method": "enhanced_adk_v1.0.0",
-            "hypothesis_id": db_hypothesis.id,
+            "hypothesis_id": hypothesis_id,
             "processed_hypothesis": clean_title,
             "confidence_score": result.get("confidence_score", 0.5),
             "research": result.get("research_data", {}),
@@ -141,22 +203,184 @@ async def process_hypothesis_adk(request_data: dict, db: Session = Depends(get_d
             "synthesis": result.get("synthesis", ""),
             "alerts": result.get("alerts", []),
             "recommendations": result.get("recommendations", ""),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "processing_stats": result.get("processing_stats", {})  # ✅ Added processing stats
         }
+    finally:
+        db.close()
+
+def _mark_hypothesis_failed(hypothesis_id: int) -> None:
+    db = SessionLocal()
+    try:
+        HypothesisCRUD.update_hypothesis(db, hypothesis_id, {"status": HypothesisStatus.FAILED})
+    finally:
+        db.close()
+
+# Identical hypotheses submitted while one is still running share that orchestrator run
+orchestrator_flight = SingleFlight()
+
+@timed("pipeline.total")
+async def run_pipeline(hypothesis_id: int, hypothesis: str, mode: str) -> None:
+    """Run the orchestrator for a pending hypothesis and publish progress to stream subscribers."""
+    try:
+        async with timed_await("pipeline.result_cache_get"):
+            result = await asyncio.to_thread(result_cache.get, hypothesis, mode)
+        if result is not None:
+            logger.info("♻️  Using cached analysis for hypothesis %s", hypothesis_id)
+            job_tracker.publish(hypothesis_id, "cached")
+        else:
+            # Process through ADK orchestrator
+            flight_key = result_cache.make_key(hypothesis, mode)
+            if orchestrator_flight.is_inflight(flight_key):
+                logger.info("🔗 Joining in-flight analysis for hypothesis %s", hypothesis_id)
+                job_tracker.publish(hypothesis_id, "coalesced")
+            
+            async with timed_await("pipeline.orchestrator"):
+                result = await orchestrator_flight.do(flight_key, lambda: orchestrator.process_hypothesis(
+                    {"hypothesis": hypothesis, "mode": mode},
+                    on_progress=lambda stage: job_tracker.publish(hypothesis_id, stage),
+                ))
+            
+            if result.get("status") == "error":
+                raise RuntimeError(result.get("error"))
+            
+            # A failed agent still yields "success" with default findings; never replay that
+            agent_errors = result.get("processing_stats", {}).get("agent_errors", 0)
+            if agent_errors:
+                logger.warning("⚠️  Not caching analysis for hypothesis %s: %d agent errors", hypothesis_id, agent_errors)
+            else:
+                async with timed_await("pipeline.result_cache_set"):
+                    await asyncio.to_thread(result_cache.set, hypothesis, mode, result)
+        
+        job_tracker.publish(hypothesis_id, "saving")
+        async with timed_await("pipeline.db_save"):
+            payload = await asyncio.to_thread(_save_pipeline_result, hypothesis_id, hypothesis, result)
+        async with timed_await("pipeline.dashboard_invalidate"):
+            await dashboard_cache.invalidate()
+        job_tracker.publish(hypothesis_id, "complete", result=payload)
+        
+    except Exception as e:
+        logger.exception("❌ ADK processing error for hypothesis %s: %s", hypothesis_id, e)
+        try:
+            await asyncio.to_thread(_mark_hypothesis_failed, hypothesis_id)
+        except Exception as db_error:
+            logger.error("❌ Failed to mark hypothesis %s as failed: %s", hypothesis_id, db_error)
+        await dashboard_cache.invalidate()
+        job_tracker.publish(hypothesis_id, "failed", error=f"ADK processing failed: {str(e)}")
+
+@app.post("/process", status_code=202, response_model=ProcessResponse)
+@timed("endpoint.process")
+async def process_hypothesis_adk(req: ProcessRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Queue a trading hypothesis for ADK processing and return its id immediately."""
+    
+    try:
+        hypothesis = req.hypothesis
+        mode = req.mode
+        
+        logger.info("🚀 Processing with ADK: %s", hypothesis)
+        
+        # Create a pending hypothesis; the pipeline fills in the analysis when it finishes
+        hypothesis_data = {
+            "title": hypothesis[:500],
+            "description": hypothesis,
+            "thesis": hypothesis,
+            "status": HypothesisStatus.PROCESSING,
+            "instruments": ["SPY"]  # Extract from context in production
+        }
+        
+        db_hypothesis = HypothesisCRUD.create_hypothesis(db, hypothesis_data)
+        await dashboard_cache.invalidate()
+        
+        job_tracker.create(db_hypothesis.id)
+        job_tracker.publish(db_hypothesis.id, "queued")
+        background_tasks.add_task(run_pipeline, db_hypothesis.id, hypothesis, mode)
+        
+        return ProcessResponse(
+            hypothesis_id=db_hypothesis.id,
+            stream_url=f"/process/{db_hypothesis.id}/stream",
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ ADK processing error: {str(e)}")
-        import traceback
-        traceback.print_exc()  # ✅ Better error debugging
+        logger.exception("❌ ADK processing error: %s", e)
         raise HTTPException(status_code=500, detail=f"ADK processing failed: {str(e)}")
 
+def _stored_state(hypothesis_id: int) -> Optional[str]:
+    """Return the stream state matching a hypothesis row, or None if there is no row.
+
+    A row left PROCESSING for longer than any run can take belongs to a pipeline that
+    died with its instance; it is marked failed here so followers get a terminal event.
+    """
+    db = SessionLocal()
+    try:
+        db_hypothesis = HypothesisCRUD.get_hypothesis(db, hypothesis_id)
+        if not db_hypothesis:
+            return None
+        if db_hypothesis.status == HypothesisStatus.PROCESSING:
+            stale_before = datetime.utcnow() - timedelta(seconds=ADK_CONFIG["stale_processing_seconds"])
+            if db_hypothesis.updated_at is None or db_hypothesis.updated_at >= stale_before:
+                return "processing"
+            HypothesisCRUD.update_hypothesis(db, hypothesis_id, {"status": HypothesisStatus.FAILED})
+            return "failed"
+        if db_hypothesis.status == HypothesisStatus.FAILED:
+            return "failed"
+        return "complete"
+    finally:
+        db.close()
+
+async def _follow_stored_state(hypothesis_id: int, state: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the stored state of an untracked job, re-reading it until it is terminal."""
+    while True:
+        yield {"hypothesis_id": hypothesis_id, "state": state}
+        if state != "processing":
+            return
+        await asyncio.sleep(STATE_POLL_SECONDS)
+        # A row deleted while we wait will never complete
+        state = await asyncio.to_thread(_stored_state, hypothesis_id) or "failed"
+
+@app.get("/process/{hypothesis_id}/stream")
+async def stream_hypothesis_progress(hypothesis_id: int):
+    """Stream pipeline progress for a hypothesis as Server-Sent Events."""
+    if job_tracker.has_job(hypothesis_id):
+        events = job_tracker.subscribe(hypothesis_id)
+    else:
+        # Job is not tracked here (finished long ago, or running on another instance);
+        # follow its row until the pipeline that owns it finishes
+        state = await asyncio.to_thread(_stored_state, hypothesis_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Hypothesis not found")
+        events = _follow_stored_state(hypothesis_id, state)
+    
+    async def event_source():
+        async for event in events:
+            yield f"event: {event['state']}\ndata: {orjson.dumps(event, default=str).decode()}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        # An explicit Content-Encoding keeps GZipMiddleware from buffering the event stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Content-Encoding": "identity"},
+    )
+
 @app.get("/dashboard")
-async def get_dashboard_data_adk(db: Session = Depends(get_db)):
+@timed("endpoint.dashboard")
+async def get_dashboard_data_adk(request: Request, db: Session = Depends(get_db)):
     """Get all hypothesis data for the dashboard - ADK version."""
     try:
+        # Version token changes whenever any hypothesis row is written
+        version = DashboardCRUD.get_dashboard_version(db)
+        etag = f'W/"{version}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        
+        async with timed_await("dashboard.cache_get"):
+            cached_body = await dashboard_cache.get(version)
+        if cached_body is not None:
+            return Response(content=cached_body, media_type="application/json", headers=headers)
+        
         summaries = DashboardCRUD.get_all_hypotheses_summary(db)
         
         # Format for frontend (same as LangGraph version)
@@ -192,10 +416,12 @@ async def get_dashboard_data_adk(db: Session = Depends(get_db)):
                 }
                 formatted_summaries.append(formatted_summary)
         
-        return {"status": "success", "data": formatted_summaries}
+        body = orjson.dumps({"status": "success", "data": formatted_summaries})
+        await dashboard_cache.set(version, body)
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except Exception as e:
-        print(f"❌ Dashboard error: {str(e)}")
+        logger.error("❌ Dashboard error: %s", e)
         raise HTTPException(status_code=500, detail=f"Dashboard error: {str(e)}")
 
 @app.get("/hypothesis/{hypothesis_id}")
@@ -213,7 +439,7 @@ async def get_hypothesis_detail_adk(hypothesis_id: int, db: Session = Depends(ge
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error getting hypothesis {hypothesis_id}: {str(e)}")
+        logger.error("❌ Error getting hypothesis %s: %s", hypothesis_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/alerts")
@@ -229,12 +455,12 @@ async def get_alerts_adk(db: Session = Depends(get_db)):
                     "type": alert.alert_type,
                     "message": alert.message,
                     "priority": alert.priority,
-                    "created_at": alert.created_at.isoformat()
+                    "created_at": alert.created_at
                 } for alert in alerts
             ]
         }
     except Exception as e:
-        print(f"❌ Error getting alerts: {str(e)}")
+        logger.error("❌ Error getting alerts: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.patch("/alerts/{alert_id}/read")
@@ -248,7 +474,7 @@ async def mark_alert_read_adk(alert_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error marking alert {alert_id} as read: {str(e)}")
+        logger.error("❌ Error marking alert %s as read: %s", alert_id, e)
         raise HTTPException(status_code=500, detail=str(e))
         
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 # CRITICAL: Warning suppression MUST be at the very top, before any other imports
 import os
+import re
 import warnings
 import logging
 
@@ -22,35 +23,50 @@ logging.getLogger('vertexai').setLevel(logging.ERROR)
 logging.getLogger('grpc').setLevel(logging.ERROR)
 logging.basicConfig(level=logging.ERROR)
 
+# Gemini warnings dropped from logs and captured stderr. 'non-text parts in the
+# response' also covers the longer 'Warning: there are non-text parts ...' form.
+_GEMINI_WARNING_PATTERNS = (
+    'non-text parts in the response',
+    'returning concatenated text result from text parts',
+    'Check the full candidates.content.parts accessor',
+)
+_GEMINI_WARNING_RE = re.compile('|'.join(map(re.escape, _GEMINI_WARNING_PATTERNS)))
+
 # Custom warning filter for Gemini-specific warnings
 class GeminiWarningFilter(logging.Filter):
     def filter(self, record):
-        message = record.getMessage() if hasattr(record, 'getMessage') else str(record)
-        warning_patterns = [
-            'Warning: there are non-text parts in the response',
-            'non-text parts in the response',
-            'returning concatenated text result from text parts',
-            'Check the full candidates.content.parts accessor'
-        ]
-        return not any(pattern in message for pattern in warning_patterns)
-
-# Apply filters
+        return _GEMINI_WARNING_RE.search(record.getMessage()) is None
+
+# Apply one stateless filter instance to every noisy logger
+_GEMINI_WARNING_FILTER = GeminiWarningFilter()
 for logger_name in ['google', 'google.generativeai', 'vertexai', 'grpc', 'google.cloud']:
-    logger = logging.getLogger(logger_name)
-    logger.addFilter(GeminiWarningFilter())
-    logger.setLevel(logging.ERROR)
+    noisy_logger = logging.getLogger(logger_name)
+    noisy_logger.addFilter(_GEMINI_WARNING_FILTER)
+    noisy_logger.setLevel(logging.ERROR)
 
 # NOW import the rest normally
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, AsyncIterator, Awaitable, List, Callable, Optional, Sequence, Tuple
 import asyncio
-import re
+import contextvars
+import functools
+import orjson
 import sys
+import threading
+import uuid
+from bisect import bisect_left, bisect_right
+from contextlib import aclosing
+from dataclasses import dataclass
 from io import StringIO
+from itertools import accumulate
+from types import MappingProxyType
 from google.adk.agents import Agent
+from google.adk.models import BaseLlm, Gemini, LLMRegistry
+from google.genai import Client
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from google.genai import errors as genai_errors
 from google.genai import types
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 from app.adk.agents.hypothesis_agent import create_hypothesis_agent
 from app.adk.agents.context_agent import create_context_agent
@@ -58,70 +74,903 @@ from app.adk.agents.research_agent import create_research_agent
 from app.adk.agents.contradiction_agent import create_contradiction_agent
 from app.adk.agents.synthesis_agent import create_synthesis_agent
 from app.adk.agents.alert_agent import create_alert_agent
+from app.adk.agent_cache import agent_cache
 from app.adk.response_handler import ADKResponseHandler
 from app.config.adk_config import ADK_CONFIG
+from app.utils.text_processor import truncate_text
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Parser patterns, compiled once at import
+_JSON_ARRAY_START_RE = re.compile(r'\[\s*\{')
+_INNER_OBJ_RE = re.compile(r'\{[^}]+\}')
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+_JSON_ARRAY_TOKEN_RE = re.compile(r'[\[\]"\\]')
+_INNER_LIST_RE = re.compile(r'\[[^\]]+\]')
+# Meta phrases stripped from synthesis text, fused so one pass removes them all
+_META_PHRASE_RE = re.compile("|".join((
+    r"Executive Summary:\s*", r"Summary:\s*", r"Buy\s*", r"Sell\s*", r"Hold\s*",
+    r"Analysis:\s*", r"Based on.*?:", r"I will.*?\.", r"Let me.*?\."
+)), re.IGNORECASE)
+_SECTION_HEADING_RE = re.compile(r'^\d+\.\s*(Business Model|Competitive|Market|Regulatory|Economic)')
+
+def _strip_numbering(text: str) -> str:
+    """Slice off a leading ``12.`` list marker and the whitespace after it, if present."""
+    i = 0
+    n = len(text)
+    while i < n and text[i].isdecimal():
+        i += 1
+    if i == 0 or i == n or text[i] != '.':
+        return text
+    i += 1
+    while i < n and text[i].isspace():
+        i += 1
+    return text[i:]
+
+def _scan_balanced(s: str, start: int, search: Callable, opener: str, closer: str) -> Optional[str]:
+    """Return ``s[start:end]`` where the ``opener`` at ``start`` is closed, skipping strings.
+
+    ``search`` finds the next bracket, quote or backslash, so the scan jumps between
+    structural characters instead of visiting every character.
+    """
+    depth = 0
+    in_str = False
+    pos = start
+    while (match := search(s, pos)) is not None:
+        c = match.group()
+        pos = match.end()
+        if in_str:
+            if c == '\\':
+                pos += 1  # skip the escaped character
+            elif c == '"':
+                in_str = False
+        elif c == '"':
+            in_str = True
+        elif c == opener:
+            depth += 1
+        elif c == closer:
+            depth -= 1
+            if depth == 0:
+                return s[start:pos]
+    return None
+
+def _extract_top_level_json(s: str) -> Optional[str]:
+    """Return the first balanced {...} object in ``s``."""
+    start = s.find('{')
+    if start < 0:
+        return None
+    return _scan_balanced(s, start, _JSON_TOKEN_RE.search, '{', '}')
+
+def _extract_json_array(s: str) -> Optional[str]:
+    """Return the first balanced array of objects in ``s``.
+
+    Linear, unlike the lazy-regex search it replaces, and keeps nested arrays of objects whole.
+    """
+    match = _JSON_ARRAY_START_RE.search(s)
+    if match is None:
+        return None
+    return _scan_balanced(s, match.start(), _JSON_ARRAY_TOKEN_RE.search, '[', ']')
+
+# Asset keywords in priority order: when several assets are mentioned, the first
+# one listed here decides
+_ASSET_KEYWORDS = (
+    ("aapl", ("Apple", "AAPL")),
+    ("tsla", ("Tesla", "TSLA")),
+    ("btc", ("Bitcoin", "BTC")),
+    ("msft", ("Microsoft", "MSFT")),
+    ("googl", ("Google", "GOOGL")),
+    ("amzn", ("Amazon", "AMZN")),
+    ("oil", ("Oil", "Crude", "WTI", "Brent")),
+)
+_ASSET_PRIORITY = tuple(asset for asset, _ in _ASSET_KEYWORDS)
+
+# One pass over the text for every keyword: a pyahocorasick automaton over the
+# lowercased text when installed, a named-group alternation otherwise
+_ASSET_RE = re.compile(
+    "|".join(f"(?P<{asset}>{'|'.join(map(re.escape, words))})" for asset, words in _ASSET_KEYWORDS),
+    re.IGNORECASE,
+)
+_ASSET_AUTOMATON = None
+if ahocorasick is not None:
+    _ASSET_AUTOMATON = ahocorasick.Automaton()
+    for _asset, _words in _ASSET_KEYWORDS:
+        for _word in _words:
+            _ASSET_AUTOMATON.add_word(_word.lower(), _asset)
+    _ASSET_AUTOMATON.make_automaton()
+
+def _mentioned_assets(text: str) -> set:
+    """Return the keys of every asset whose keywords appear in ``text``, ignoring case."""
+    lowered = text.lower()
+    if _ASSET_AUTOMATON is not None and len(lowered) == len(text):
+        return {asset for _, asset in _ASSET_AUTOMATON.iter(lowered)}
+    return {match.lastgroup for match in _ASSET_RE.finditer(text)}
+
+# asset_info for the mentions we have details for; other matches keep the fallback context
+_ASSET_INFOS = {
+    "aapl": {
+        "primary_symbol": "AAPL",
+        "asset_name": "Apple Inc.",
+        "asset_type": "stock",
+        "sector": "Technology",
+        "market": "NASDAQ",
+        "current_price": 195.64
+    },
+    "tsla": {
+        "primary_symbol": "TSLA",
+        "asset_name": "Tesla Inc.",
+        "asset_type": "stock",
+        "sector": "Automotive",
+        "market": "NASDAQ",
+        "current_price": 250.00
+    },
+    "btc": {
+        "primary_symbol": "BTC-USD",
+        "asset_name": "Bitcoin",
+        "asset_type": "cryptocurrency",
+        "sector": "Cryptocurrency",
+        "market": "Crypto",
+        "current_price": 45000.00
+    },
+    "oil": {
+        "primary_symbol": "CL=F",
+        "asset_name": "Crude Oil",
+        "asset_type": "commodity",
+        "sector": "Energy",
+        "market": "NYMEX",
+        "current_price": 85.00
+    },
+}
+
+# Prompt templates per agent, filled by _format_agent_input with str.format_map
+_AGENT_PROMPT_TEMPLATES = {
+    "hypothesis": """Process this trading hypothesis in {mode} mode:
+
+"{hypothesis}"
+
+Please provide a clean, structured hypothesis statement.""",
+
+    "context": """Analyze the context and extract structured information for this trading hypothesis:
+
+"{hypothesis}"
+
+Provide detailed JSON analysis including asset information, hypothesis parameters, research guidance, and risk factors.""",
+
+    "research": """Conduct comprehensive research for this trading hypothesis:
+
+Hypothesis: "{hypothesis}"
+
+Asset Details:
+- Name: {asset_name}
+- Symbol: {symbol}
+- Type: {asset_type}
+- Sector: {sector}
+
+Research Focus:
+- Key metrics: {key_metrics}
+- Search terms: {search_terms}
+
+Use your available tools to gather market data and news information.""",
+
+    "contradiction": """Identify contradictions and risk factors for this trading hypothesis:
+
+Hypothesis: "{hypothesis}"
+
+Asset Context: {asset_name}
+Research Summary: {research_summary}
+
+Find specific risks, challenges, and contradictory evidence that could invalidate this hypothesis.""",
+
+    "synthesis": """Synthesize a comprehensive investment analysis for this hypothesis:
+
+Hypothesis: "{hypothesis}"
+
+Asset: {asset_name}
+Research: {research_summary}
+Risk Factors: {risk_factors}
+
+Provide balanced analysis with supporting confirmations, confidence assessment, and investment recommendation.""",
+
+    "alert": """Generate actionable alerts and recommendations for this investment hypothesis:
+
+Hypothesis: "{hypothesis}"
+
+Analysis Summary:
+- Confidence Score: {confidence:.2f}
+- Risk Factors: {contradictions_count}
+- Supporting Factors: {confirmations_count}
+- Synthesis: {synthesis}
+
+Provide specific, actionable alerts with clear priorities and investment recommendations.""",
+}
+
+# Context used when the context agent output cannot be parsed; copied before use
+_FALLBACK_CONTEXT = {
+    "asset_info": {
+        "primary_symbol": "SPY",
+        "asset_name": "Financial Asset",
+        "asset_type": "equity",
+        "sector": "Technology",
+        "market": "NASDAQ",
+        "competitors": ["QQQ", "VTI"],
+        "current_price": 450.00
+    },
+    "hypothesis_details": {
+        "direction": "neutral",
+        "confidence_level": "medium",
+        "timeframe": "3-6 months",
+        "price_target": None
+    },
+    "research_guidance": {
+        "search_terms": ["market analysis", "financial data", "earnings"],
+        "key_metrics": ["price", "volume", "earnings", "revenue"],
+        "monitoring_events": ["earnings", "market news", "economic data"]
+    },
+    "risk_analysis": {
+        "primary_risks": ["market volatility", "economic uncertainty", "sector rotation"],
+        "contradiction_areas": ["valuation concerns", "competitive pressure"],
+        "sensitivity_factors": ["interest rates", "market sentiment"]
+    }
+}
+
+_FALLBACK_CONTEXT_JSON = orjson.dumps(_FALLBACK_CONTEXT)
+
+# Shared read-only default for optional nested dicts, so lookups on a miss allocate nothing
+_EMPTY = MappingProxyType({})
+
+# Alert fields accepted from the alert agent's JSON: the types its instruction lists
+# plus the ones the text fallback assigns
+_ALERT_TYPES = frozenset(("entry", "risk", "monitor", "exit", "recommendation", "risk_management"))
+_ALERT_PRIORITIES = frozenset(("high", "medium", "low"))
+
+# Phrase tables of the line-based text fallbacks, built once instead of per call/line
+_CONTRADICTION_META_PHRASES = (
+    "I will analyze", "I will look for", "I will investigate",
+    "Okay", "I'll examine", "Let me", "I need to",
+    "Here are", "I'll check", "I'll search", "will investigate",
+    "will look into", "will examine", "will analyze",
+)
+# Any of the meta phrases anywhere in a line, in one regex pass
+_CONTRADICTION_META_RE = re.compile('|'.join(map(re.escape, _CONTRADICTION_META_PHRASES)))
+_CONFIRMATION_SKIP_PHRASES = (
+    "Summary:", "Buy", "Sell", "Hold", "Analysis:",
+    "I will", "Let me", "Here are", "Following",
+    "Based on", "I'll provide", "Executive Summary",
+)
+_POSITIVE_INDICATORS = (
+    'growth', 'strong', 'increase', 'improve', 'expand',
+    'momentum', 'positive', 'bullish', 'advantage', 'leading',
+    'revenue', 'margin', 'profit', 'demand', 'adoption',
+)
+# Lead-ins stripped from agent answers, with the whitespace after them; anchored, so
+# a miss fails on the first few characters without lowercasing anything
+_RESPONSE_PREFIX_RE = re.compile(r"^(?:" + "|".join(map(re.escape, (
+    "Here's the processed hypothesis:",
+    "Here is the processed hypothesis:",
+    "Processed hypothesis:",
+    "The processed hypothesis is:",
+    "Analysis:",
+    "Response:",
+    "Output:",
+))) + r")\s*", re.IGNORECASE)
+_ONE_WORD_RESPONSES = frozenset(("Buy", "Sell", "Hold", "Summary"))
+_ALERT_SKIP_PHRASES = (
+    "I will generate", "Let me create", "Based on", "Here are",
+    "I'll provide", "Alert Agent", "I need to", "Following the",
+)
+_ALERT_ACTION_WORDS = ('Enter', 'Set', 'Monitor', 'Wait', 'Consider', 'Watch', 'Avoid', 'Take')
+_RISK_MANAGEMENT_WORDS = ('Set stop', 'risk', 'loss')
+_MONITOR_WORDS = ('Monitor', 'Watch')
+_ENTRY_WORDS = ('Enter', 'Buy', 'Sell')
+_HIGH_PRIORITY_WORDS = ('immediately', 'critical', 'urgent')
+_LOW_PRIORITY_WORDS = ('consider', 'optional', 'if')
+
+@dataclass(frozen=True, slots=True)
+class Finding:
+    """A contradiction or confirmation; parsers hand these out as plain dicts."""
+    quote: str
+    reason: str
+    source: str
+    strength: str = "Medium"
+    
+    def to_dict(self) -> Dict[str, str]:
+        return {"quote": self.quote, "reason": self.reason, "source": self.source, "strength": self.strength}
+
+# Fallbacks when an agent's answer yields no usable findings
+_DEFAULT_CONTRADICTIONS = (
+    Finding(
+        "Market valuations at elevated levels may limit upside potential in the near term.",
+        "High valuations often precede periods of consolidation or correction.",
+        "Valuation Analysis",
+    ),
+    Finding(
+        "Competitive pressures intensifying as rivals increase market share investments.",
+        "Increased competition can erode margins and market position over time.",
+        "Competitive Analysis",
+    ),
+    Finding(
+        "Regulatory scrutiny increasing in the technology sector could impact operations.",
+        "Regulatory changes may create compliance costs and operational constraints.",
+        "Regulatory Risk",
+    ),
+)
+_DEFAULT_CONFIRMATIONS = (
+    Finding(
+        "Strong market fundamentals and improving financial metrics support growth trajectory.",
+        "Fundamental analysis indicates favorable conditions for appreciation.",
+        "Fundamental Analysis",
+    ),
+    Finding(
+        "Technical indicators showing positive momentum with price above key moving averages.",
+        "Technical setup suggests continued upward price movement potential.",
+        "Technical Analysis",
+    ),
+    Finding(
+        "Institutional investor interest remains strong with recent position increases.",
+        "Smart money flows indicate confidence in the investment thesis.",
+        "Fund Flows",
+    ),
+)
+
+# Fallback alerts as (type, message) at medium priority, and their joined recommendation
+_DEFAULT_ALERTS = (
+    ("recommendation", "Monitor price action and volume for entry signals"),
+    ("risk_management", "Set appropriate stop-loss levels based on volatility"),
+)
+_DEFAULT_RECOMMENDATIONS = " ".join(message for _, message in _DEFAULT_ALERTS)
+
+# Parsers stop collecting once they hold this many items
+_MAX_ALERTS = 5
+# Research summaries are cut near here; agent prompts quote only their first 500 chars
+_RESEARCH_SUMMARY_MAX_CHARS = 8192
+_MAX_CONTRADICTIONS = 5
+# Parsers only look at this much of an agent response; bounds the quadratic worst
+# case of the brace/bracket and lazy-match patterns on runaway output
+_MAX_PARSE_CHARS = 65536
+
+# Confidence buckets: <= 0.4, (0.4, 0.6], > 0.6
+_CONFIDENCE_THRESHOLDS = (0.4, 0.6)
+_OUTLOOK_BY_BUCKET = ("challenging", "moderate", "favorable")
+_RECOMMENDATION_BY_BUCKET = (
+    "Recommendation: Exercise caution and wait for better entry conditions.",
+    "Recommendation: Monitor closely before taking position.",
+    "Recommendation: Consider position with appropriate risk management.",
+)
+
+# Upstream quota/overload statuses worth retrying with backoff
+_RETRYABLE_LLM_STATUS = frozenset((429, 503))
+
+def _is_retryable_llm_error(exc: BaseException) -> bool:
+    return isinstance(exc, genai_errors.APIError) and exc.code in _RETRYABLE_LLM_STATUS
+
+# Agent construction validates config, instructions and tools; build each template agent
+# once per process and hand orchestrators cheap copies
+_AGENT_FACTORIES: Dict[str, Callable[[], Agent]] = {
+    "hypothesis": functools.lru_cache(maxsize=1)(create_hypothesis_agent),
+    "context": functools.lru_cache(maxsize=1)(create_context_agent),
+    "research": functools.lru_cache(maxsize=1)(create_research_agent),
+    "contradiction": functools.lru_cache(maxsize=1)(create_contradiction_agent),
+    "synthesis": functools.lru_cache(maxsize=1)(create_synthesis_agent),
+    "alert": functools.lru_cache(maxsize=1)(create_alert_agent),
+}
+
+# Scalar template fields per agent beyond the hypothesis, looked up by agent name.
+# Nested context lookups fall back to the shared empty mapping.
+
+def _asset_info(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    return (input_data.get('context') or _EMPTY).get('asset_info') or _EMPTY
+
+def _research_summary(input_data: Dict[str, Any]) -> str:
+    return (input_data.get('research_data') or _EMPTY).get('summary', '')[:500]
+
+def _hypothesis_prompt_fields(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"mode": input_data.get('mode', 'analyze')}
+
+def _context_prompt_fields(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {}
+
+def _research_prompt_fields(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    context = input_data.get('context') or _EMPTY
+    asset_info = context.get('asset_info') or _EMPTY
+    research_guidance = context.get('research_guidance') or _EMPTY
+    return {
+        "asset_name": asset_info.get('asset_name', 'Unknown'),
+        "symbol": asset_info.get('primary_symbol', 'N/A'),
+        "asset_type": asset_info.get('asset_type', 'Unknown'),
+        "sector": asset_info.get('sector', 'Unknown'),
+        "key_metrics": ', '.join(research_guidance.get('key_metrics', ['price', 'volume'])),
+        "search_terms": ', '.join(research_guidance.get('search_terms', ['market data'])),
+    }
+
+def _contradiction_prompt_fields(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "research_summary": _research_summary(input_data),
+        "asset_name": _asset_info(input_data).get('asset_name', 'Unknown asset'),
+    }
+
+def _synthesis_prompt_fields(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    contradictions = input_data.get('contradictions')
+    return {
+        "research_summary": _research_summary(input_data),
+        "asset_name": _asset_info(input_data).get('asset_name', 'Unknown'),
+        "risk_factors": f"{len(contradictions)} identified" if contradictions is not None else "assessed separately",
+    }
+
+def _alert_prompt_fields(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "confidence": input_data.get('confidence_score', 0.5),
+        "contradictions_count": len(input_data.get('contradictions', [])),
+        "confirmations_count": len(input_data.get('confirmations', [])),
+        "synthesis": (input_data.get('synthesis') or _EMPTY).get('analysis', '')[:300],
+    }
+
+_AGENT_PROMPT_FIELDS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "hypothesis": _hypothesis_prompt_fields,
+    "context": _context_prompt_fields,
+    "research": _research_prompt_fields,
+    "contradiction": _contradiction_prompt_fields,
+    "synthesis": _synthesis_prompt_fields,
+    "alert": _alert_prompt_fields,
+}
+
+@functools.lru_cache(maxsize=512)
+def _render_agent_prompt(agent_name: str, fields: Tuple[Tuple[str, Any], ...]) -> str:
+    """Fill an agent's template; fields are usually scalar, so retried workflows hit the cache."""
+    return _AGENT_PROMPT_TEMPLATES[agent_name].format_map(dict(fields))
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """One node of the workflow graph run by ``TradeSageOrchestrator._run_stages``.
+
+    ``run`` is an orchestrator method called with the results of the finished stages
+    keyed by stage name. Stages without a ``description`` are internal steps and are
+    not reported as progress.
+    """
+    name: str
+    depends_on: Tuple[str, ...]
+    run: Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+    description: str = ""
+
+class PipelineStageError(Exception):
+    """A pipeline stage failed; ``stage`` names it and the cause is chained."""
+    
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"{stage} stage failed: {error}")
+        self.stage = stage
+
+# Per-request agent counters (cache hits/misses, agent errors); stage tasks share the
+# dict set by process_hypothesis
+_agent_stats: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "tradesage_agent_stats", default=None
+)
+
+def _count_agent(outcome: str) -> None:
+    stats = _agent_stats.get()
+    if stats is not None:
+        stats[outcome] += 1
+
+def _validate_pipeline(stages: Tuple[PipelineStage, ...]) -> Tuple[PipelineStage, ...]:
+    """Reject graphs whose stages depend on unknown or later stages.
+
+    Declaring stages in dependency order rules out cycles, which would otherwise leave
+    a stage waiting forever on an event that is never set.
+    """
+    seen = set()
+    for stage in stages:
+        missing = [name for name in stage.depends_on if name not in seen]
+        if missing or stage.name in seen:
+            raise ValueError(f"Invalid pipeline stage {stage.name!r}: duplicate name or undeclared dependencies {missing}")
+        seen.add(stage.name)
+    return stages
+
+class _KeywordLineIndex:
+    """Find the lines of a text that contain any keyword, in one pass over the text.
+
+    Uses a pyahocorasick automaton when installed and a compiled alternation otherwise;
+    matching is case-insensitive either way unless ``case_sensitive`` is set.
+    """
+    
+    def __init__(self, keywords, case_sensitive: bool = False):
+        self._automaton = None
+        self._case_sensitive = case_sensitive
+        self._regex = re.compile("|".join(map(re.escape, keywords)), 0 if case_sensitive else re.IGNORECASE)
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword if case_sensitive else keyword.lower(), len(keyword))
+            self._automaton.make_automaton()
+    
+    def matching_lines(self, text: str, lines: List[str]) -> set:
+        """Return indices into ``lines`` (``text.split('\\n')``) that contain a keyword."""
+        # Offset of the first character of each line, for mapping match positions to lines
+        line_starts = [0, *accumulate(len(line) + 1 for line in lines[:-1])]
+        
+        lowered = text if self._case_sensitive else text.lower()
+        if self._automaton is not None and len(lowered) == len(text):
+            ends = (end for end, _ in self._automaton.iter(lowered))
+        else:
+            ends = (match.end() - 1 for match in self._regex.finditer(text))
+        return {bisect_right(line_starts, end) - 1 for end in ends}
+
+_RISK_INDICATORS = _KeywordLineIndex((
+    'risk', 'challenge', 'concern', 'pressure', 'decline',
+    'competition', 'regulation', 'slowdown', 'saturation',
+    'uncertainty', 'headwind', 'weakness',
+))
+_POSITIVE_LINES = _KeywordLineIndex(_POSITIVE_INDICATORS)
+
+class _KeywordLineTagger:
+    """Label each line of a text with the bit flags of the keywords it contains.
+
+    ``tagged`` pairs a bit flag with its keywords. The whole text is scanned once,
+    with a pyahocorasick automaton when installed and otherwise a lookahead
+    alternation that finds a match at every position, overlapping ones included.
+    A keyword carries the flags of every keyword it contains, so the longest match
+    at a position stands in for the shorter ones.
+    """
+    
+    def __init__(self, tagged, case_sensitive: bool = False):
+        self._case_sensitive = case_sensitive
+        flags = {}
+        for flag, keywords in tagged:
+            for keyword in keywords:
+                key = keyword if case_sensitive else keyword.lower()
+                flags[key] = flags.get(key, 0) | flag
+        self._flags = {}
+        for key in flags:
+            implied = 0
+            for other, flag in flags.items():
+                if other in key:
+                    implied |= flag
+            self._flags[key] = implied
+        
+        alternation = "|".join(map(re.escape, sorted(self._flags, key=len, reverse=True)))
+        self._regex = re.compile(f"(?=({alternation}))", 0 if case_sensitive else re.IGNORECASE)
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for key, implied in self._flags.items():
+                self._automaton.add_word(key, implied)
+            self._automaton.make_automaton()
+    
+    def tag_lines(self, text: str, lines: List[str]) -> Dict[int, int]:
+        """Map indices into ``lines`` (``text.split('\\n')``) to their OR-ed flags."""
+        line_starts = [0, *accumulate(len(line) + 1 for line in lines[:-1])]
+        
+        lowered = text if self._case_sensitive else text.lower()
+        if self._automaton is not None and len(lowered) == len(text):
+            hits = self._automaton.iter(lowered)
+        else:
+            fold = (lambda s: s) if self._case_sensitive else str.lower
+            get = self._flags.get
+            # Text that only matches through Unicode case folding is no keyword
+            hits = ((match.start() + len(match.group(1)) - 1, get(fold(match.group(1)), 0))
+                    for match in self._regex.finditer(text))
+        
+        tags: Dict[int, int] = {}
+        for end, flag in hits:
+            index = bisect_right(line_starts, end) - 1
+            tags[index] = tags.get(index, 0) | flag
+        return tags
+
+# Alert line flags: phrases are matched case-sensitively, priorities on lowercase
+_ALERT_SKIP, _ALERT_ACTION, _ALERT_RISK, _ALERT_MONITOR, _ALERT_ENTRY = 1, 2, 4, 8, 16
+_PRIORITY_HIGH, _PRIORITY_LOW = 1, 2
+_ALERT_LINE_TAGS = _KeywordLineTagger((
+    (_ALERT_SKIP, _ALERT_SKIP_PHRASES),
+    (_ALERT_ACTION, _ALERT_ACTION_WORDS),
+    (_ALERT_RISK, _RISK_MANAGEMENT_WORDS),
+    (_ALERT_MONITOR, _MONITOR_WORDS),
+    (_ALERT_ENTRY, _ENTRY_WORDS),
+), case_sensitive=True)
+_PRIORITY_LINE_TAGS = _KeywordLineTagger((
+    (_PRIORITY_HIGH, _HIGH_PRIORITY_WORDS),
+    (_PRIORITY_LOW, _LOW_PRIORITY_WORDS),
+))
+
+def _finding_from_item(item: Dict[str, Any], default_reason: str) -> Dict[str, Any]:
+    """Normalize one agent-supplied finding object; non-string fields raise TypeError."""
+    return {
+        "quote": item.get("quote", "")[:400],
+        "reason": item.get("reason", default_reason)[:400],
+        "source": item.get("source", "Market Analysis")[:40],
+        "strength": item.get("strength", "Medium")
+    }
+
+# Quote and bullet characters trimmed from both ends of a finding line. str.strip
+# with a constant is a C-level scan; an anchored regex sub is ~20x slower here.
+_FINDING_EDGE_CHARS = '"\'""''*•-–—'
+# Bullet and quote characters trimmed from both ends of an alert line
+_ALERT_EDGE_CHARS = '•-*"\''
+
+@dataclass(frozen=True, slots=True)
+class _FindingRules:
+    """How the text fallback turns lines of an agent answer into findings."""
+    lines: _KeywordLineIndex  # only lines with one of these keywords are candidates
+    min_line_length: int
+    is_meta: Callable[[str], Any]  # truthy for instructions and headings to skip
+    reason: str
+    limit: int
+    strip_numbering: bool = False
+
+def _is_contradiction_meta(line: str) -> bool:
+    # Only lines starting with a digit can be numbered headings, so the rest never
+    # reach that regex
+    return bool(_CONTRADICTION_META_RE.search(line)
+                or (line[0].isdecimal() and _SECTION_HEADING_RE.match(line)))
+
+def _is_confirmation_meta(line: str) -> bool:
+    return any(phrase in line for phrase in _CONFIRMATION_SKIP_PHRASES) or line in _ONE_WORD_RESPONSES
+
+_CONTRADICTION_RULES = _FindingRules(
+    lines=_RISK_INDICATORS,
+    min_line_length=30,
+    is_meta=_is_contradiction_meta,
+    reason="Market analysis identifies this as a potential challenge to the investment thesis.",
+    limit=_MAX_CONTRADICTIONS,
+    strip_numbering=True,
+)
+_CONFIRMATION_RULES = _FindingRules(
+    lines=_POSITIVE_LINES,
+    min_line_length=40,
+    is_meta=_is_confirmation_meta,
+    reason="Market analysis supports this positive factor for the investment thesis.",
+    limit=5,
+)
+
+def _scan_findings(text: str, rules: _FindingRules) -> List[Dict[str, Any]]:
+    """Collect findings from the candidate lines of ``text``, in order, up to ``rules.limit``."""
+    findings = []
+    append = findings.append
+    lines = text.split('\n')
+    
+    # Lines without a keyword can never become findings, so they are never visited
+    for index in sorted(rules.lines.matching_lines(text, lines)):
+        line = lines[index].strip()
+        
+        # Skip short lines and meta-analysis
+        if len(line) < rules.min_line_length or rules.is_meta(line):
+            continue
+        
+        # Clean up quotes and formatting
+        cleaned = line.strip(_FINDING_EDGE_CHARS)
+        if rules.strip_numbering:
+            cleaned = _strip_numbering(cleaned)
+        
+        if len(cleaned) > 30:
+            append({
+                "quote": cleaned[:400],
+                "reason": rules.reason,
+                "source": "Market Analysis",
+                "strength": "Medium"
+            })
+            if len(findings) >= rules.limit:
+                break
+    return findings
+
+_WARNING_LINES = _KeywordLineIndex(_GEMINI_WARNING_PATTERNS, case_sensitive=True)
 
 class WarningSuppressionContext:
-    """Context manager to completely suppress Gemini warnings during operations"""
+    """Context manager to completely suppress Gemini warnings during operations
+
+    Redirects file descriptor 2 into a pipe, so writes from gRPC/abseil C++ code are
+    captured along with ``sys.stderr``. A reader thread drains the pipe as it fills and
+    forwards every complete line that is not a Gemini warning to the original stderr
+    right away, so other output is only delayed by the filter, never held back.
+
+    Agents run concurrently, so the redirect is shared and reference counted: the
+    first context to enter installs it, nested entries only bump the count, and the
+    last one to exit restores fd 2 and leaves the reader to flush the pipe's tail and
+    close its copy of the original stderr, so exiting never waits on the reader.
+    Without a usable fd 2 the context does nothing.
+    """
     
-    def __init__(self):
-        self.original_stderr = sys.stderr
-        self.suppressed_stderr = StringIO()
-        self.warning_patterns = [
-            'Warning: there are non-text parts in the response',
-            'non-text parts in the response',
-            'returning concatenated text result from text parts',
-            'Check the full candidates.content.parts accessor'
-        ]
+    _lock = threading.Lock()
+    _depth = 0
+    _saved_fd: Optional[int] = None
+    
+    @staticmethod
+    def _forward(data: bytes, out_fd: int) -> None:
+        """Write the lines of ``data`` that are not warnings to ``out_fd``."""
+        text = data.decode("utf-8", errors="replace")
+        lines = text.split('\n')
+        warnings_at = _WARNING_LINES.matching_lines(text, lines)
+        kept = [line for index, line in enumerate(lines) if index not in warnings_at and line.strip()]
+        if not kept:
+            return
+        out = ('\n'.join(kept) + '\n').encode("utf-8", errors="replace")
+        try:
+            while out:
+                out = out[os.write(out_fd, out):]
+        except OSError:
+            pass  # original stderr is gone; nothing left to show the output on
+    
+    @classmethod
+    def _drain(cls, read_fd: int, out_fd: int) -> None:
+        """Forward the pipe until EOF, then close both fds; the reader owns ``out_fd``."""
+        pending = b""
+        try:
+            while chunk := os.read(read_fd, 65536):
+                pending += chunk
+                # Filter whole lines only; a long unterminated line is passed on as is
+                cut = pending.rfind(b'\n') + 1
+                if not cut and len(pending) >= 65536:
+                    cut = len(pending)
+                if cut:
+                    cls._forward(pending[:cut], out_fd)
+                    pending = pending[cut:]
+            if pending:
+                cls._forward(pending, out_fd)
+        finally:
+            os.close(read_fd)
+            os.close(out_fd)
     
     def __enter__(self):
-        sys.stderr = self.suppressed_stderr
+        cls = type(self)
+        with cls._lock:
+            if cls._depth == 0:
+                cls._redirect()
+            cls._depth += 1
         return self
     
+    @classmethod
+    def _redirect(cls) -> None:
+        try:
+            sys.stderr.flush()
+            saved_fd = os.dup(2)
+        except (OSError, ValueError, AttributeError):
+            return  # no real stderr to capture
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, 2)
+        os.close(write_fd)
+        cls._saved_fd = saved_fd
+        threading.Thread(
+            target=cls._drain, args=(read_fd, saved_fd), name="stderr-drain", daemon=True
+        ).start()
+    
     def __exit__(self, exc_type, exc_val, exc_tb):
-        captured = self.suppressed_stderr.getvalue()
-        sys.stderr = self.original_stderr
-        
-        # Only show lines that don't match warning patterns
-        if captured:
-            lines = captured.split('\n')
-            filtered_lines = []
-            for line in lines:
-                if line.strip() and not any(pattern in line for pattern in self.warning_patterns):
-                    filtered_lines.append(line)
-            
-            if filtered_lines:
-                print('\n'.join(filtered_lines), file=sys.stderr)
+        cls = type(self)
+        with cls._lock:
+            cls._depth -= 1
+            if cls._depth > 0 or cls._saved_fd is None:
+                return
+            try:
+                sys.stderr.flush()
+            except (OSError, ValueError):
+                pass
+            # Restoring fd 2 closes the pipe's last write end, so the reader sees EOF,
+            # forwards what is left and closes saved_fd on its own thread
+            os.dup2(cls._saved_fd, 2)
+            cls._saved_fd = None
 
 class TradeSageOrchestrator:
     """Enhanced ADK-based orchestrator with COMPLETE warning elimination and clean output."""
 
     def __init__(self):
-        self.agents = self._initialize_agents()
+        # Agents and their runners are built on first use, see _get_runner
+        self.agents: Dict[str, Agent] = {}
         self.session_service = InMemorySessionService()
+        # Caps concurrent LLM turns across all hypotheses in this worker
+        self._llm_semaphore = asyncio.Semaphore(ADK_CONFIG["max_concurrent_llm_calls"])
+        # ... and per agent, so a burst of one slow agent (research runs tools) cannot
+        # take every slot and stall the other stages of in-flight hypotheses
+        self._agent_semaphores = {
+            name: asyncio.Semaphore(ADK_CONFIG["max_concurrent_per_agent"]) for name in _AGENT_FACTORIES
+        }
+        # Runners hold no per-call state, so one per agent is reused for every run
+        self.runners: Dict[str, Runner] = {}
         self.response_handler = ADKResponseHandler()
+        self._models: Dict[str, BaseLlm] = {}
         
-        print("✅ TradeSage ADK Orchestrator initialized (clean output version)")
+        logger.info("✅ TradeSage ADK Orchestrator initialized (clean output version)")
         
-    def _initialize_agents(self) -> Dict[str, Agent]:
-        """Initialize all agents."""
+    def _get_agent(self, agent_name: str) -> Agent:
+        """Return this orchestrator's copy of an agent, building it on first use."""
+        agent = self.agents.get(agent_name)
+        if agent is None:
+            factory = _AGENT_FACTORIES.get(agent_name)
+            if factory is None:
+                raise ValueError(f"Agent '{agent_name}' not found")
+            # Shallow copy: warmup rebinds ``model`` per orchestrator, which must not
+            # leak into other instances sharing the cached agent
+            agent = factory().model_copy()
+            if isinstance(agent.model, str) and agent.model in self._models:
+                agent.model = self._models[agent.model]
+            self.agents[agent_name] = agent
+        return agent
+    
+    def _model_name(self, agent_name: str) -> str:
+        model = self._get_agent(agent_name).model
+        return model if isinstance(model, str) else getattr(model, "model", "")
+    
+    def _get_runner(self, agent_name: str) -> Runner:
+        runner = self.runners.get(agent_name)
+        if runner is None:
+            runner = Runner(
+                agent=self._get_agent(agent_name),
+                app_name=f"tradesage_{agent_name}",
+                session_service=self.session_service,
+            )
+            self.runners[agent_name] = runner
+        return runner
+    
+    async def warmup(self) -> None:
+        """Resolve agent models once and build their API clients before the first request.
+
+        An agent whose ``model`` is a string gets a fresh LLM wrapper (and genai client)
+        on every call, so each model name is resolved to one shared instance here. All
+        agents are built here too so the first request does not pay for it.
+        """
+        for agent_name in _AGENT_FACTORIES:
+            try:
+                self._get_agent(agent_name)
+            except Exception as e:
+                logger.error("❌ Error initializing %s agent: %s", agent_name, e)
+        
+        for agent in self.agents.values():
+            if isinstance(agent.model, str) and agent.model:
+                if agent.model not in self._models:
+                    self._models[agent.model] = LLMRegistry.new_llm(agent.model)
+                agent.model = self._models[agent.model]
+        
+        # Building the client loads credentials, which blocks; keep it off the event loop
+        for model_name, llm in self._models.items():
+            try:
+                if isinstance(llm, Gemini):
+                    llm.__dict__["api_client"] = await asyncio.to_thread(self._build_api_client, llm)
+                else:
+                    await asyncio.to_thread(getattr, llm, "api_client")
+            except Exception as e:
+                logger.warning("⚠️  Failed to warm up client for %s: %s", model_name, e)
+        
+        logger.info("🔥 Warmed up %d model client(s) for %d agents", len(self._models), len(self.agents))
+    
+    def _build_api_client(self, llm: Gemini) -> Client:
+        """Build a genai client whose pooled httpx connections use HTTP/2 and stay alive.
+
+        Falls back to the model's default client when HTTP/2 support (``h2``) is missing.
+        """
+        import httpx
+        
+        client_args = {
+            "http2": ADK_CONFIG["llm_http2"],
+            "limits": httpx.Limits(
+                max_connections=ADK_CONFIG["llm_max_connections"],
+                max_keepalive_connections=ADK_CONFIG["llm_max_keepalive_connections"],
+            ),
+        }
         try:
-            agents = {
-                "hypothesis": create_hypothesis_agent(),
-                "context": create_context_agent(),
-                "research": create_research_agent(),
-                "contradiction": create_contradiction_agent(),
-                "synthesis": create_synthesis_agent(),
-                "alert": create_alert_agent(),
-            }
-            print(f"✅ Initialized {len(agents)} agents")
-            return agents
-        except Exception as e:
-            print(f"❌ Error initializing agents: {str(e)}")
-            raise
+            return Client(http_options=types.HttpOptions(
+                headers=llm._tracking_headers,
+                client_args=client_args,
+                async_client_args=client_args,
+            ))
+        except ImportError as e:
+            logger.warning("⚠️  HTTP/2 unavailable for LLM client, using defaults: %s", e)
+            return llm.api_client
     
-    async def process_hypothesis(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a trading hypothesis through the ADK agent workflow."""
+    async def aclose(self) -> None:
+        """Close the shared model clients opened by ``warmup``."""
+        for llm in self._models.values():
+            client = llm.__dict__.get("api_client")
+            aio = getattr(client, "aio", None)
+            if hasattr(aio, "aclose"):
+                try:
+                    await aio.aclose()
+                except Exception as e:
+                    logger.warning("⚠️  Failed to close model client: %s", e)
+        self._models.clear()
+    
+    async def process_hypothesis(self, input_data: Dict[str, Any],
+                                 on_progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Process a trading hypothesis through the ADK agent workflow.
+
+        ``on_progress`` is called with the name of each stage as it starts.
+        """
         
         hypothesis_text = input_data.get("hypothesis", "").strip()
         if not hypothesis_text:
@@ -131,95 +980,25 @@ class TradeSageOrchestrator:
                 "method": "adk_orchestration"
             }
         
-        print(f"🚀 Starting ADK workflow for: {hypothesis_text[:100]}...")
+        logger.info("🚀 Starting ADK workflow for: %.100s...", hypothesis_text)
+        
+        # The request itself is the graph's only source; stages read it as "input"
+        results: Dict[str, Any] = {"input": {**input_data, "hypothesis": hypothesis_text}}
+        agent_stats = {"hits": 0, "misses": 0, "errors": 0}
+        _agent_stats.set(agent_stats)
         
         try:
-            # Step 1: Process Hypothesis
-            print("🧠 Processing hypothesis...")
-            hypothesis_result = await self._run_agent_completely_silent("hypothesis", {
-                "hypothesis": hypothesis_text,
-                "mode": input_data.get("mode", "analyze")
-            })
-            
-            processed_hypothesis = self._extract_response(hypothesis_result["final_text"])
-            if not processed_hypothesis:
-                processed_hypothesis = hypothesis_text  # Fallback
-            
-            print(f"   ✅ Processed: {processed_hypothesis[:80]}...")
-            
-            # Step 2: Analyze Context  
-            print("🔍 Analyzing context...")
-            context_result = await self._run_agent_completely_silent("context", {
-                "hypothesis": processed_hypothesis
-            })
-            
-            context = self._parse_json_response(context_result["final_text"])
-            asset_info = context.get("asset_info", {})
-            print(f"   ✅ Asset identified: {asset_info.get('asset_name', 'Unknown')} ({asset_info.get('primary_symbol', 'N/A')})")
-            
-            # Step 3: Conduct Research
-            print("📊 Conducting research...")
-            research_result = await self._run_agent_completely_silent("research", {
-                "hypothesis": processed_hypothesis,
-                "context": context
-            })
-            
-            # Handle research response with tools
-            research_summary = self._extract_research_summary_from_tools(research_result)
-            tool_summary = self.response_handler.get_tool_summary(research_result)
-            
-            if tool_summary['tools_called'] > 0:
-                print(f"   ✅ Research completed with {tool_summary['tools_called']} tool calls")
-                print(f"   🔧 Tools used: {', '.join(tool_summary['tool_names'])}")
-            else:
-                print(f"   ✅ Research completed: {len(research_summary)} chars")
-            
-            research_data = {
-                "summary": research_summary,
-                "tool_results": research_result.get("tool_results", {}),
-                "method": "adk_research_with_tools",
-                "tools_used": research_result.get("function_calls", [])
-            }
-            
-            # Step 4: Identify Contradictions
-            print("⚠️  Identifying contradictions...")
-            contradiction_result = await self._run_agent_completely_silent("contradiction", {
-                "hypothesis": processed_hypothesis,
-                "context": context,
-                "research_data": research_data
-            })
-            
-            contradictions = self._parse_contradictions_response(contradiction_result["final_text"])
-            print(f"   ✅ Found {len(contradictions)} contradictions")
-            
-            # Step 5: Synthesize Analysis
-            print("🔬 Synthesizing analysis...")
-            synthesis_result = await self._run_agent_completely_silent("synthesis", {
-                "hypothesis": processed_hypothesis,
-                "context": context,
-                "research_data": research_data,
-                "contradictions": contradictions
-            })
+            await self._run_stages(self.PIPELINE, results, on_progress)
             
-            synthesis_data = self._parse_synthesis_response(synthesis_result["final_text"], contradictions)
+            processed_hypothesis = results["hypothesis"]
+            context = results["context"]
+            research_data = results["research"]
+            contradictions = results["contradiction"]
+            synthesis_data = results["synthesis_data"]
             confirmations = synthesis_data.get("confirmations", [])
             confidence_score = synthesis_data.get("confidence_score", 0.5)
-            print(f"   ✅ Synthesis complete - Confidence: {confidence_score:.2f}")
-            
-            # Step 6: Generate Alerts
-            print("🚨 Generating alerts...")
-            alert_result = await self._run_agent_completely_silent("alert", {
-                "hypothesis": processed_hypothesis,
-                "context": context,
-                "synthesis": synthesis_data,
-                "contradictions": contradictions,
-                "confirmations": confirmations,
-                "confidence_score": confidence_score
-            })
-            
-            alerts_data = self._parse_alerts_response(alert_result["final_text"])
+            alerts_data = results["alert"]
             alerts = alerts_data.get("alerts", [])
-            print(f"   ✅ Generated {len(alerts)} alerts")
             
             # Compile final result
             result = {
@@ -235,142 +1014,214 @@ class TradeSageOrchestrator:
                 "confidence_score": confidence_score,
                 "method": "adk_clean_output",
                 "processing_stats": {
-                    "total_agents": len(self.agents),
+                    "total_agents": len(_AGENT_FACTORIES),
                     "contradictions_found": len(contradictions),
                     "confirmations_found": len(confirmations),
                     "alerts_generated": len(alerts),
-                    "research_tools_used": len(research_data.get("tools_used", []))
+                    "research_tools_used": len(research_data.get("tools_used", [])),
+                    "agent_cache_hits": agent_stats["hits"],
+                    "agent_cache_misses": agent_stats["misses"],
+                    # Agents whose failure was papered over with parser defaults
+                    "agent_errors": agent_stats["errors"],
                 }
             }
             
-            print(f"✅ ADK workflow completed successfully")
+            logger.info("✅ ADK workflow completed successfully")
             return result
             
         except Exception as e:
-            print(f"❌ Orchestration error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Orchestration error: %s", e)
+            # Independent branches may have finished before the failure; keep them all
             return {
                 "status": "error",
                 "error": str(e),
+                "failed_stage": getattr(e, "stage", None),
                 "method": "adk_clean_output",
                 "partial_data": {
                     "hypothesis": hypothesis_text,
-                    "processed_hypothesis": locals().get("processed_hypothesis", ""),
-                    "context": locals().get("context", {}),
+                    "processed_hypothesis": results.get("hypothesis", ""),
+                    "context": results.get("context", {}),
+                    "research_data": results.get("research", {}),
+                    "contradictions": results.get("contradiction", []),
                 }
             }
 
+    async def _run_stages(self, stages: Sequence[PipelineStage], results: Dict[str, Any],
+                          on_progress: Optional[Callable[[str], None]] = None) -> None:
+        """Run pipeline stages as a dependency graph, filling ``results`` by stage name.
+
+        Every stage starts as soon as all of its ``depends_on`` stages have finished, so
+        independent stages overlap. The stages share one task group: a failure cancels the
+        rest and is re-raised as is, leaving the finished stages in ``results``. A stage
+        running longer than ``stage_timeout_seconds`` fails with ``TimeoutError``.
+        """
+        finished = {stage.name: asyncio.Event() for stage in stages}
+        stage_timeout = ADK_CONFIG["stage_timeout_seconds"] or None
+        
+        async def run_stage(stage: PipelineStage) -> None:
+            for dependency in stage.depends_on:
+                await finished[dependency].wait()
+            if stage.description:
+                logger.info(stage.description)
+                self._report_progress(on_progress, stage.name)
+            deadline = asyncio.timeout(stage_timeout)
+            try:
+                async with deadline:
+                    results[stage.name] = await stage.run(self, results)
+            except Exception as e:
+                if isinstance(e, TimeoutError) and deadline.expired():
+                    # asyncio's TimeoutError has no message; say which budget ran out
+                    raise PipelineStageError(stage.name, TimeoutError(f"timed out after {stage_timeout:g}s")) from e
+                raise PipelineStageError(stage.name, e) from e
+            finished[stage.name].set()
+        
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for stage in stages:
+                    tg.create_task(run_stage(stage))
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+    
+    # Pipeline stages. Each receives the results of the finished stages keyed by stage
+    # name, plus the request under "input"
+    
+    async def _stage_hypothesis(self, results: Dict[str, Any]) -> str:
+        request = results["input"]
+        hypothesis_result = await self._run_agent_completely_silent("hypothesis", {
+            "hypothesis": request["hypothesis"],
+            "mode": request.get("mode", "analyze")
+        })
+        processed = self._extract_response(hypothesis_result["final_text"]) or request["hypothesis"]
+        logger.info("   ✅ Processed: %.80s...", processed)
+        return processed
+    
+    async def _stage_context(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        # Context only needs the asset and targets, which the raw text already carries
+        context_result = await self._run_agent_completely_silent("context", {
+            "hypothesis": results["input"]["hypothesis"]
+        })
+        context = self._parse_json_response(context_result["final_text"])
+        asset_info = context.get("asset_info") or _EMPTY
+        logger.info("   ✅ Asset identified: %s (%s)", asset_info.get('asset_name', 'Unknown'), asset_info.get('primary_symbol', 'N/A'))
+        return context
+    
+    async def _stage_research(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        research_result = await self._run_agent_completely_silent("research", {
+            "hypothesis": results["hypothesis"],
+            "context": results["context"]
+        })
+        
+        # Handle research response with tools; rendering multi-KB tool payloads is pure
+        # CPU, so it runs off the event loop like the parsers
+        research_summary = await asyncio.to_thread(self._extract_research_summary_from_tools, research_result)
+        if logger.isEnabledFor(logging.INFO):
+            tool_summary = self.response_handler.get_tool_summary(research_result)
+            if tool_summary['tools_called'] > 0:
+                logger.info("   ✅ Research completed with %d tool calls", tool_summary['tools_called'])
+                logger.info("   🔧 Tools used: %s", ', '.join(tool_summary['tool_names']))
+            else:
+                logger.info("   ✅ Research completed: %d chars", len(research_summary))
+        
+        return {
+            "summary": research_summary,
+            "tool_results": research_result.get("tool_results", {}),
+            "method": "adk_research_with_tools",
+            "tools_used": research_result.get("function_calls", [])
+        }
+    
+    async def _stage_contradiction(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        contradiction_result = await self._run_agent_completely_silent("contradiction", {
+            "hypothesis": results["hypothesis"],
+            "context": results["context"],
+            "research_data": results["research"]
+        })
+        # The text parsers are pure CPU over multi-KB responses; run them off the event
+        # loop so concurrent hypotheses and in-flight agent streams keep being served
+        contradictions = await asyncio.to_thread(
+            self._parse_contradictions_response, contradiction_result["final_text"]
+        )
+        logger.info("   ✅ Found %d contradictions", len(contradictions))
+        return contradictions
+    
+    async def _stage_synthesis(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        # The synthesis prompt only needs the research; contradictions are folded in
+        # when parsing, so this call overlaps the contradiction agent
+        return await self._run_agent_completely_silent("synthesis", {
+            "hypothesis": results["hypothesis"],
+            "context": results["context"],
+            "research_data": results["research"]
+        })
+    
+    async def _stage_synthesis_data(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        synthesis_data = await asyncio.to_thread(
+            self._parse_synthesis_response, results["synthesis"]["final_text"], results["contradiction"]
+        )
+        logger.info("   ✅ Synthesis complete - Confidence: %.2f", synthesis_data.get("confidence_score", 0.5))
+        return synthesis_data
+    
+    async def _stage_alert(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        synthesis_data = results["synthesis_data"]
+        alert_result = await self._run_agent_completely_silent("alert", {
+            "hypothesis": results["hypothesis"],
+            "context": results["context"],
+            "synthesis": synthesis_data,
+            "contradictions": results["contradiction"],
+            "confirmations": synthesis_data.get("confirmations", []),
+            "confidence_score": synthesis_data.get("confidence_score", 0.5)
+        })
+        alerts_data = await asyncio.to_thread(self._parse_alerts_response, alert_result["final_text"])
+        logger.info("   ✅ Generated %d alerts", len(alerts_data.get("alerts", [])))
+        return alerts_data
+    
+    # The workflow graph. A stage starts as soon as every stage it depends on has
+    # finished; the alert prompt needs the parsed synthesis, so it cannot start earlier
+    PIPELINE: Tuple[PipelineStage, ...] = _validate_pipeline((
+        PipelineStage("hypothesis", (), _stage_hypothesis, "🧠 Processing hypothesis..."),
+        PipelineStage("context", (), _stage_context, "🔍 Analyzing context..."),
+        PipelineStage("research", ("hypothesis", "context"), _stage_research, "📊 Conducting research..."),
+        PipelineStage("contradiction", ("research",), _stage_contradiction, "⚠️  Identifying contradictions..."),
+        PipelineStage("synthesis", ("research",), _stage_synthesis, "🔬 Synthesizing analysis..."),
+        PipelineStage("synthesis_data", ("synthesis", "contradiction"), _stage_synthesis_data),
+        PipelineStage("alert", ("synthesis_data",), _stage_alert, "🚨 Generating alerts..."),
+    ))
+    
+    def _report_progress(self, on_progress: Optional[Callable[[str], None]], stage: str) -> None:
+        """Notify a progress listener without letting it break the workflow."""
+        if on_progress is None:
+            return
+        try:
+            on_progress(stage)
+        except Exception as e:
+            logger.warning("⚠️  Progress callback failed for %s: %s", stage, e)
+
     async def _run_agent_completely_silent(self, agent_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Run agent with COMPLETE warning suppression."""
-        if agent_name not in self.agents:
+        if agent_name not in _AGENT_FACTORIES:
             raise ValueError(f"Agent '{agent_name}' not found")
         
         try:
-            agent = self.agents[agent_name]
-            
-            # Create session for this agent
-            app_name = f"tradesage_{agent_name}"
-            user_id = "tradesage_user"
-            session_id = f"session_{agent_name}_{id(input_data)}"
-            
-            # Create session
-            session = await self.session_service.create_session(
-                app_name=app_name,
-                user_id=user_id, 
-                session_id=session_id
-            )
-            
-            # Create runner
-            runner = Runner(
-                agent=agent,
-                app_name=app_name,
-                session_service=self.session_service
-            )
-            
             # Format input as message
             user_message = self._format_agent_input(agent_name, input_data)
-            message = types.Content(
-                role='user',
-                parts=[types.Part(text=user_message)]
-            )
-            
-            # COMPLETE WARNING SUPPRESSION: Use context manager
-            with WarningSuppressionContext():
-                # Collect ALL events and parts properly
-                all_events = []
-                text_responses = []
-                function_calls = []
-                function_responses = []
-                tool_results = {}
-                errors = []
-                
-                # Process all events and handle ALL part types
-                async for event in runner.run_async(
-                    user_id=user_id,
-                    session_id=session_id, 
-                    new_message=message
-                ):
-                    all_events.append(event)
-                    
-                    # Handle different event types - process ALL parts to avoid warnings
-                    if hasattr(event, 'content') and event.content:
-                        if hasattr(event.content, 'parts') and event.content.parts:
-                            for part in event.content.parts:
-                                # Handle ALL part types to avoid warnings
-                                
-                                # Handle text parts
-                                if hasattr(part, 'text') and part.text:
-                                    text_responses.append(part.text)
-                                
-                                # Handle function calls (prevents warning about non-text parts)
-                                elif hasattr(part, 'function_call') and part.function_call:
-                                    function_call = {
-                                        "name": part.function_call.name,
-                                        "args": dict(part.function_call.args) if part.function_call.args else {}
-                                    }
-                                    function_calls.append(function_call)
-                                
-                                # Handle function responses (prevents warning about non-text parts)
-                                elif hasattr(part, 'function_response') and part.function_response:
-                                    function_response = {
-                                        "name": part.function_response.name,
-                                        "response": part.function_response.response
-                                    }
-                                    function_responses.append(function_response)
-                                    
-                                    # Store tool results for easy access
-                                    tool_results[part.function_response.name] = part.function_response.response
-                                
-                                # Handle any other part types to prevent warnings
-                                else:
-                                    # This catches any other part types and processes them silently
-                                    pass
-                    
-                    # Handle errors
-                    if hasattr(event, 'error') and event.error:
-                        errors.append(str(event.error))
             
-            # Combine all response parts properly
-            final_text = " ".join(text_responses) if text_responses else ""
+            # A cached response skips the session, runner and LLM round-trip entirely
+            model_name = self._model_name(agent_name)
+            cached_response = await agent_cache.get(agent_name, user_message, model_name)
+            if cached_response is not None:
+                _count_agent("hits")
+                logger.info("   ♻️  %s served from agent cache", agent_name)
+                return cached_response
+            _count_agent("misses")
             
-            # If we have function calls but no text response, create summary
-            if function_calls and not final_text:
-                final_text = f"Completed {len(function_calls)} tool calls successfully."
-            
-            response_data = {
-                "final_text": final_text,
-                "text_parts": text_responses,
-                "function_calls": function_calls,
-                "function_responses": function_responses,
-                "tool_results": tool_results,
-                "errors": errors,
-                "has_tools": len(function_calls) > 0
-            }
+            try:
+                response_data = await self._invoke_runner(agent_name, user_message)
+            except BaseException:
+                # Failed or cancelled (stage timeout); nothing will be stored for this prompt
+                agent_cache.discard(agent_name, user_message, model_name)
+                raise
             
             # Log tool usage without individual function call details
-            if response_data["function_calls"]:
-                print(f"   🔧 {agent_name} used {len(response_data['function_calls'])} tools")
+            if response_data["function_calls"] and logger.isEnabledFor(logging.INFO):
+                logger.info("   🔧 %s used %d tools", agent_name, len(response_data['function_calls']))
                 # Group by tool name for cleaner output
                 tool_counts = {}
                 for call in response_data["function_calls"]:
@@ -379,21 +1230,25 @@ class TradeSageOrchestrator:
                 
                 for tool_name, count in tool_counts.items():
                     if count > 1:
-                        print(f"      - {tool_name} (x{count})")
+                        logger.info("      - %s (x%d)", tool_name, count)
                     else:
-                        print(f"      - {tool_name}")
+                        logger.info("      - %s", tool_name)
             
             if response_data["errors"]:
-                print(f"   ⚠️  {agent_name} reported {len(response_data['errors'])} errors")
+                logger.warning("   ⚠️  %s reported %d errors", agent_name, len(response_data['errors']))
+                agent_cache.discard(agent_name, user_message, model_name)
+                _count_agent("errors")
+            else:
+                await agent_cache.set(agent_name, user_message, response_data, model_name)
             
             return response_data
             
         except Exception as e:
             error_msg = f"Error running {agent_name} agent: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
+            _count_agent("errors")
             return {
                 "final_text": error_msg,
-                "text_parts": [error_msg],
                 "function_calls": [],
                 "function_responses": [],
                 "tool_results": {},
@@ -401,8 +1256,137 @@ class TradeSageOrchestrator:
                 "has_tools": False
             }
 
-    def _extract_research_summary_from_tools(self, research_result: Dict) -> str:
-        """Extract research summary properly handling tool results"""
+    async def _run_agent_stream(self, agent_name: str, user_message: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one agent turn's output as ``{"kind", "data"}`` items while it streams.
+
+        Kinds are ``text`` (a text fragment), ``tool_call`` and ``tool_response``
+        (name plus args/response) and ``error``. Runs on a fresh session and holds a
+        slot of the agent's and the shared LLM semaphore until the generator finishes
+        or is closed.
+        """
+        runner = self._get_runner(agent_name)
+        
+        # Always agent first, then shared: a fixed order, and a turn waiting on its
+        # agent's limit does not hold a shared slot meanwhile
+        async with self._agent_semaphores[agent_name], self._llm_semaphore:
+            # Fresh session per call: a shared one would feed earlier runs' events back
+            # into the prompt. id(input_data) could also repeat across concurrent runs.
+            user_id = "tradesage_user"
+            session_id = f"session_{agent_name}_{uuid.uuid4().hex}"
+        
+            # Create session
+            await self.session_service.create_session(
+                app_name=runner.app_name,
+                user_id=user_id, 
+                session_id=session_id
+            )
+        
+            message = types.Content(
+                role='user',
+                parts=[types.Part(text=user_message)]
+            )
+        
+            # COMPLETE WARNING SUPPRESSION: Use context manager
+            try:
+                with WarningSuppressionContext():
+                    # aclosing: stopping early still finalizes the run (and its LLM
+                    # stream) right away instead of whenever the generator is collected
+                    async with aclosing(runner.run_async(
+                        user_id=user_id,
+                        session_id=session_id, 
+                        new_message=message
+                    )) as events:
+                        async for event in events:
+                            # Handle different event types - process ALL parts to avoid warnings.
+                            # One getattr per field, bound once, instead of hasattr + re-fetch
+                            content = getattr(event, 'content', None)
+                            parts = getattr(content, 'parts', None) if content else None
+                            if parts:
+                                for part in parts:
+                                    if text := getattr(part, 'text', None):
+                                        yield {"kind": "text", "data": text}
+                                    elif function_call := getattr(part, 'function_call', None):
+                                        yield {"kind": "tool_call", "data": {
+                                            "name": function_call.name,
+                                            "args": dict(function_call.args) if function_call.args else {}
+                                        }}
+                                    elif function_response := getattr(part, 'function_response', None):
+                                        yield {"kind": "tool_response", "data": {
+                                            "name": function_response.name,
+                                            "response": function_response.response
+                                        }}
+                            
+                            error = getattr(event, 'error', None)
+                            if error:
+                                yield {"kind": "error", "data": str(error)}
+                    
+                            # Nothing after the final response is used; stop awaiting trailing events
+                            if event.is_final_response():
+                                break
+            finally:
+                await self.session_service.delete_session(
+                    app_name=runner.app_name, user_id=user_id, session_id=session_id
+                )
+
+    @retry(
+        retry=retry_if_exception(_is_retryable_llm_error),
+        stop=stop_after_attempt(ADK_CONFIG["llm_max_attempts"]),
+        wait=wait_random_exponential(multiplier=1, max=20),
+        reraise=True,
+    )
+    async def _invoke_runner(self, agent_name: str, user_message: str) -> Dict[str, Any]:
+        """Run one agent turn and collect its text, tool calls and errors.
+
+        Quota and overload errors (429/503) are retried with jittered backoff, on a new
+        session and without holding an LLM semaphore slot while waiting.
+        """
+        # Parts are collected as they stream; events themselves are not retained
+        text_buffer = StringIO()
+        function_calls = []
+        function_responses = []
+        tool_results = {}
+        errors = []
+        write_text = text_buffer.write
+        
+        async with aclosing(self._run_agent_stream(agent_name, user_message)) as stream:
+            async for item in stream:
+                kind, data = item["kind"], item["data"]
+                if kind == "text":
+                    write_text(data)
+                elif kind == "tool_call":
+                    function_calls.append(data)
+                elif kind == "tool_response":
+                    function_responses.append(data)
+                    # Store tool results for easy access
+                    tool_results[data["name"]] = data["response"]
+                else:
+                    errors.append(data)
+        
+        # Parts are fragments of the model's output, written back to back so the
+        # model's own formatting is preserved
+        final_text = text_buffer.getvalue()
+    
+        # If we have function calls but no text response, create summary
+        if function_calls and not final_text:
+            final_text = f"Completed {len(function_calls)} tool calls successfully."
+    
+        # final_text is the only copy of the text, in memory and in the agent cache
+        return {
+            "final_text": final_text,
+            "function_calls": function_calls,
+            "function_responses": function_responses,
+            "tool_results": tool_results,
+            "errors": errors,
+            "has_tools": len(function_calls) > 0
+        }
+
+    def _extract_research_summary_from_tools(self, research_result: Dict,
+                                             max_chars: int = _RESEARCH_SUMMARY_MAX_CHARS) -> str:
+        """Extract research summary properly handling tool results.
+
+        Stops adding tool sections once the summary would exceed ``max_chars``; the
+        summary is only ever shown or quoted in part, so the rest would be discarded.
+        """
         
         # If we have tool results, format them properly
         if research_result.get("tool_results"):
@@ -411,45 +1395,49 @@ class TradeSageOrchestrator:
             # Add agent's text analysis if available
             if research_result.get("final_text"):
                 formatted_sections.append("## Agent Analysis")
-                formatted_sections.append(research_result["final_text"])
+                formatted_sections.append(truncate_text(research_result["final_text"], max_chars))
             
             # Add tool results
             formatted_sections.append("\n## Tool Results")
+            # Joined length so far: each section plus its newline separator
+            used = sum(map(len, formatted_sections)) + len(formatted_sections)
             
             for tool_name, result in research_result["tool_results"].items():
-                formatted_sections.append(f"\n### {tool_name}")
+                if used > max_chars:
+                    formatted_sections.append("... [truncated]")
+                    break
+                section = [f"\n### {tool_name}"]
                 
                 try:
                     # Try to parse as JSON if it's structured data
                     if isinstance(result, str) and result.startswith('{'):
-                        parsed_result = json.loads(result)
+                        parsed_result = orjson.loads(result)
                         status = parsed_result.get('status', 'unknown')
-                        formatted_sections.append(f"Status: {status}")
+                        section.append(f"Status: {status}")
                         
                         # Format market data
-                        if 'data' in parsed_result and 'info' in parsed_result.get('data', {}):
+                        if 'data' in parsed_result and 'info' in (parsed_result.get('data') or _EMPTY):
                             info = parsed_result['data']['info']
-                            formatted_sections.append(f"Current Price: ${info.get('currentPrice', 'N/A')}")
-                            formatted_sections.append(f"Daily Change: {info.get('dayChangePercent', 0):+.2f}%")
-                            formatted_sections.append(f"Volume: {info.get('volume', 'N/A'):,}")
+                            section.append(f"Current Price: ${info.get('currentPrice', 'N/A')}")
+                            section.append(f"Daily Change: {info.get('dayChangePercent', 0):+.2f}%")
+                            section.append(f"Volume: {info.get('volume', 'N/A'):,}")
                         
                         # Format news data
                         elif 'articles' in parsed_result:
                             articles = parsed_result['articles'][:3]  # Top 3 articles
-                            formatted_sections.append(f"Found {len(parsed_result['articles'])} articles")
+                            section.append(f"Found {len(parsed_result['articles'])} articles")
                             for i, article in enumerate(articles, 1):
-                                formatted_sections.append(f"{i}. {article.get('title', 'No title')}")
+                                section.append(f"{i}. {article.get('title', 'No title')}")
                     
                     else:
                         # Handle non-JSON results
-                        result_str = str(result)
-                        if len(result_str) > 200:
-                            formatted_sections.append(result_str[:200] + "...")
-                        else:
-                            formatted_sections.append(result_str)
+                        section.append(self.response_handler.preview(result, 200))
                             
                 except Exception as e:
-                    formatted_sections.append(f"Tool result (parsing failed): {str(result)[:100]}...")
+                    section.append(f"Tool result (parsing failed): {self.response_handler.preview(result, 100)}")
+                
+                formatted_sections += section
+                used += sum(map(len, section)) + len(section)
             
             return "\n".join(formatted_sections)
         
@@ -459,191 +1447,62 @@ class TradeSageOrchestrator:
     def _parse_contradictions_response(self, response_text: str) -> List[Dict]:
         """Parse contradictions from agent response - FIXED VERSION"""
         contradictions = []
+        response_text = response_text[:_MAX_PARSE_CHARS]
         
         # First, try to parse as JSON array
         try:
             # Look for JSON array in response
-            json_match = re.search(r'\[\s*\{.*?\}\s*\]', response_text, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
+            json_array = _extract_json_array(response_text)
+            if json_array:
+                parsed = orjson.loads(json_array)
                 if isinstance(parsed, list):
                     for item in parsed:
                         if isinstance(item, dict) and 'quote' in item:
-                            contradictions.append({
-                                "quote": item.get("quote", "")[:400],
-                                "reason": item.get("reason", "Market analysis identifies this challenge")[:400],
-                                "source": item.get("source", "Market Analysis")[:40],
-                                "strength": item.get("strength", "Medium")
-                            })
-                    return contradictions[:5]  # Limit to 5
-        except:
+                            contradictions.append(_finding_from_item(item, "Market analysis identifies this challenge"))
+                            if len(contradictions) >= _MAX_CONTRADICTIONS:
+                                break
+                    return contradictions
+        except (orjson.JSONDecodeError, TypeError):
+            # Malformed array or a non-string field; use the text fallback
             pass
         
         # Fallback: Parse text looking for real contradictions
-        lines = response_text.split('\n')
-        
-        # Filter out meta-analysis lines
-        meta_phrases = [
-            "I will analyze", "I will look for", "I will investigate",
-            "Okay", "I'll examine", "Let me", "I need to",
-            "Here are", "I'll check", "I'll search", "will investigate",
-            "will look into", "will examine", "will analyze"
-        ]
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and meta-analysis
-            if len(line) < 30:
-                continue
-                
-            # Skip lines that are instructions/meta-analysis
-            if any(phrase in line for phrase in meta_phrases):
-                continue
-            
-            # Skip numbered items that are just descriptions
-            if re.match(r'^\d+\.\s*(Business Model|Competitive|Market|Regulatory|Economic)', line):
-                continue
-            
-            # Look for actual market risks
-            risk_indicators = ['risk', 'challenge', 'concern', 'pressure', 'decline', 
-                              'competition', 'regulation', 'slowdown', 'saturation',
-                              'uncertainty', 'headwind', 'weakness']
-            
-            if any(indicator in line.lower() for indicator in risk_indicators):
-                # Clean up quotes and formatting
-                cleaned = line.strip('"\'""''*•-–—')
-                cleaned = re.sub(r'^\d+\.\s*', '', cleaned)  # Remove numbering
-                
-                if len(cleaned) > 30:
-                    contradictions.append({
-                        "quote": cleaned[:400],
-                        "reason": "Market analysis identifies this as a potential challenge to the investment thesis.",
-                        "source": "Market Analysis",
-                        "strength": "Medium"
-                    })
+        contradictions = _scan_findings(response_text, _CONTRADICTION_RULES)
         
         # If no good contradictions found, generate defaults
         if not contradictions:
-            contradictions = [
-                {
-                    "quote": "Market valuations at elevated levels may limit upside potential in the near term.",
-                    "reason": "High valuations often precede periods of consolidation or correction.",
-                    "source": "Valuation Analysis",
-                    "strength": "Medium"
-                },
-                {
-                    "quote": "Competitive pressures intensifying as rivals increase market share investments.",
-                    "reason": "Increased competition can erode margins and market position over time.",
-                    "source": "Competitive Analysis",
-                    "strength": "Medium"
-                },
-                {
-                    "quote": "Regulatory scrutiny increasing in the technology sector could impact operations.",
-                    "reason": "Regulatory changes may create compliance costs and operational constraints.",
-                    "source": "Regulatory Risk",
-                    "strength": "Medium"
-                }
-            ]
+            contradictions = [finding.to_dict() for finding in _DEFAULT_CONTRADICTIONS]
         
-        return contradictions[:5]
+        return contradictions[:_MAX_CONTRADICTIONS]
 
     def _parse_synthesis_response(self, response_text: str, contradictions: List[Dict]) -> Dict[str, Any]:
         """Parse synthesis response and extract confirmations - FIXED VERSION"""
         
         confirmations = []
+        response_text = response_text[:_MAX_PARSE_CHARS]
         
-        # Try to extract structured confirmations from response
-        try:
-            # Look for JSON-like confirmations
-            json_matches = re.findall(r'\{[^}]+\}', response_text)
-            for match in json_matches:
-                try:
-                    parsed = json.loads(match)
-                    if 'quote' in parsed:
-                        confirmations.append({
-                            "quote": parsed.get("quote", "")[:400],
-                            "reason": parsed.get("reason", "")[:400],
-                            "source": parsed.get("source", "Market Analysis")[:40],
-                            "strength": parsed.get("strength", "Medium")
-                        })
-                except:
-                    continue
-        except:
-            pass
+        # Try to extract structured confirmations from response; only objects that
+        # mention a "quote" key can become confirmations, so the rest are never decoded
+        for match in _INNER_OBJ_RE.findall(response_text):
+            if '"quote"' not in match:
+                continue
+            try:
+                parsed = orjson.loads(match)
+                if 'quote' in parsed:
+                    confirmations.append(_finding_from_item(parsed, ""))
+            except (orjson.JSONDecodeError, TypeError):
+                continue
         
         # Parse text for positive statements if no JSON found
         if not confirmations:
-            lines = response_text.split('\n')
-            
-            # Skip meta-analysis phrases
-            skip_phrases = [
-                "Summary:", "Buy", "Sell", "Hold", "Analysis:",
-                "I will", "Let me", "Here are", "Following",
-                "Based on", "I'll provide", "Executive Summary"
-            ]
-            
-            positive_indicators = [
-                'growth', 'strong', 'increase', 'improve', 'expand',
-                'momentum', 'positive', 'bullish', 'advantage', 'leading',
-                'revenue', 'margin', 'profit', 'demand', 'adoption'
-            ]
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Skip short lines and meta text
-                if len(line) < 40:
-                    continue
-                    
-                # Skip lines with meta-analysis
-                if any(phrase in line for phrase in skip_phrases):
-                    continue
-                
-                # Skip simple one-word responses
-                if line in ["Buy", "Sell", "Hold", "Summary"]:
-                    continue
-                
-                # Look for positive market facts
-                if any(indicator in line.lower() for indicator in positive_indicators):
-                    cleaned = line.strip('"\'""''*•-–—')
-                    if len(cleaned) > 30:
-                        confirmations.append({
-                            "quote": cleaned[:400],
-                            "reason": "Market analysis supports this positive factor for the investment thesis.",
-                            "source": "Market Analysis",
-                            "strength": "Medium"
-                        })
-                        
-                    if len(confirmations) >= 5:
-                        break
+            confirmations = _scan_findings(response_text, _CONFIRMATION_RULES)
         
         # Generate default confirmations if needed
         if len(confirmations) < 3:
-            default_confirmations = [
-                {
-                    "quote": "Strong market fundamentals and improving financial metrics support growth trajectory.",
-                    "reason": "Fundamental analysis indicates favorable conditions for appreciation.",
-                    "source": "Fundamental Analysis",
-                    "strength": "Medium"
-                },
-                {
-                    "quote": "Technical indicators showing positive momentum with price above key moving averages.",
-                    "reason": "Technical setup suggests continued upward price movement potential.",
-                    "source": "Technical Analysis",
-                    "strength": "Medium"
-                },
-                {
-                    "quote": "Institutional investor interest remains strong with recent position increases.",
-                    "reason": "Smart money flows indicate confidence in the investment thesis.",
-                    "source": "Fund Flows",
-                    "strength": "Medium"
-                }
-            ]
-            
             # Add defaults to reach minimum of 3
-            while len(confirmations) < 3 and default_confirmations:
-                confirmations.append(default_confirmations.pop(0))
+            confirmations.extend(
+                finding.to_dict() for finding in _DEFAULT_CONFIRMATIONS[:3 - len(confirmations)]
+            )
         
         # Calculate confidence score
         conf_count = len(confirmations)
@@ -662,37 +1521,29 @@ class TradeSageOrchestrator:
         synthesis_text = response_text
         
         # Remove any JSON artifacts
-        synthesis_text = re.sub(r'\{[^}]+\}', '', synthesis_text)
-        synthesis_text = re.sub(r'\[[^\]]+\]', '', synthesis_text)
+        synthesis_text = _INNER_OBJ_RE.sub('', synthesis_text)
+        synthesis_text = _INNER_LIST_RE.sub('', synthesis_text)
         
         # Remove meta-analysis phrases
-        meta_removal = [
-            r"Summary:\s*", r"Buy\s*", r"Sell\s*", r"Hold\s*",
-            r"Executive Summary:\s*", r"Analysis:\s*",
-            r"Based on.*?:", r"I will.*?\.", r"Let me.*?\."
-        ]
-        
-        for pattern in meta_removal:
-            synthesis_text = re.sub(pattern, '', synthesis_text, flags=re.IGNORECASE)
+        synthesis_text = _META_PHRASE_RE.sub('', synthesis_text)
         
         # Clean up the text
         synthesis_text = ' '.join(synthesis_text.split())
         
         if len(synthesis_text) < 100:
+            bucket = bisect_left(_CONFIDENCE_THRESHOLDS, confidence)
             synthesis_text = f"""
 Investment Analysis for the hypothesis:
 
 Based on the analysis of {conf_count} supporting factors and {contra_count} risk factors, 
-the investment thesis shows {'favorable' if confidence > 0.6 else 'moderate' if confidence > 0.4 else 'challenging'} 
+the investment thesis shows {_OUTLOOK_BY_BUCKET[bucket]} 
 prospects. The confidence level of {confidence:.1%} reflects the balance between positive 
 catalysts and identified risks.
 
 Key supporting factors include market fundamentals, technical indicators, and institutional interest.
 Primary risks involve valuation concerns, competitive pressures, and market conditions.
 
-{'Recommendation: Consider position with appropriate risk management.' if confidence > 0.6 else 
- 'Recommendation: Monitor closely before taking position.' if confidence > 0.4 else
- 'Recommendation: Exercise caution and wait for better entry conditions.'}
+{_RECOMMENDATION_BY_BUCKET[bucket]}
 """.strip()
         
         return {
@@ -704,182 +1555,109 @@ Primary risks involve valuation concerns, competitive pressures, and market cond
     def _parse_alerts_response(self, response_text: str) -> Dict[str, Any]:
         """Parse alerts response - FIXED VERSION"""
         alerts = []
+        response_text = response_text[:_MAX_PARSE_CHARS]
         
-        # Try to extract JSON array of alerts
-        try:
-            json_match = re.search(r'\[\s*\{.*?\}\s*\]', response_text, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
-                if isinstance(parsed, list):
-                    for item in parsed:
-                        if isinstance(item, dict) and 'message' in item:
-                            alerts.append({
-                                "type": item.get("type", "recommendation"),
-                                "message": item.get("message", "")[:500],
-                                "priority": item.get("priority", "medium")
-                            })
-                    if alerts:
-                        return {
-                            "alerts": alerts[:5],
-                            "recommendations": " ".join([a["message"] for a in alerts[:3]])
-                        }
-        except:
-            pass
+        # Try to extract JSON array of alerts; an array without a "message" key cannot
+        # yield any, so it is not decoded
+        json_array = _extract_json_array(response_text)
+        if json_array and '"message"' in json_array:
+            try:
+                parsed = orjson.loads(json_array)
+            except orjson.JSONDecodeError:
+                parsed = None
+            if isinstance(parsed, list):
+                for item in parsed:
+                    if isinstance(item, dict) and isinstance(item.get('message'), str):
+                        alert_type = item.get("type")
+                        priority = item.get("priority")
+                        alerts.append({
+                            "type": alert_type if isinstance(alert_type, str) and alert_type in _ALERT_TYPES else "recommendation",
+                            "message": item["message"][:500],
+                            "priority": priority if isinstance(priority, str) and priority in _ALERT_PRIORITIES else "medium"
+                        })
+                        if len(alerts) >= _MAX_ALERTS:
+                            break
+                if alerts:
+                    return {
+                        "alerts": alerts,
+                        "recommendations": " ".join([a["message"] for a in alerts[:3]])
+                    }
         
         # Parse text for actionable alerts
+        append = alerts.append
+        # One scan per tagger labels every line; only lines with an action word and
+        # no meta phrase can become alerts
         lines = response_text.split('\n')
+        line_tags = _ALERT_LINE_TAGS.tag_lines(response_text, lines)
+        candidates = sorted(
+            index for index, tags in line_tags.items()
+            if tags & (_ALERT_ACTION | _ALERT_SKIP) == _ALERT_ACTION
+        )
+        priority_tags = _PRIORITY_LINE_TAGS.tag_lines(response_text, lines) if candidates else {}
         
-        # Skip meta-analysis phrases
-        skip_phrases = [
-            "I will generate", "Let me create", "Based on", "Here are",
-            "I'll provide", "Alert Agent", "I need to", "Following the"
-        ]
-        
-        for line in lines:
-            line = line.strip('•-*"\'')
+        for index in candidates:
+            line = lines[index].strip(_ALERT_EDGE_CHARS)
             
             # Skip short lines and meta text
             if len(line) < 20:
                 continue
-                
-            # Skip meta-analysis lines
-            if any(phrase in line for phrase in skip_phrases):
-                continue
             
-            # Look for actionable content
-            action_words = ['Enter', 'Set', 'Monitor', 'Wait', 'Consider', 'Watch', 'Avoid', 'Take']
-            
-            if any(word in line for word in action_words):
-                # Determine alert type
+            # Determine alert type
+            tags = line_tags[index]
+            if tags & _ALERT_RISK:
+                alert_type = "risk_management"
+            elif tags & _ALERT_MONITOR:
+                alert_type = "monitor"
+            elif tags & _ALERT_ENTRY:
+                alert_type = "entry"
+            else:
                 alert_type = "recommendation"
-                if any(word in line for word in ['Set stop', 'risk', 'loss']):
-                    alert_type = "risk_management"
-                elif any(word in line for word in ['Monitor', 'Watch']):
-                    alert_type = "monitor"
-                elif any(word in line for word in ['Enter', 'Buy', 'Sell']):
-                    alert_type = "entry"
-                
-                # Determine priority
+            
+            # Determine priority
+            priority_flags = priority_tags.get(index, 0)
+            if priority_flags & _PRIORITY_HIGH:
+                priority = "high"
+            elif priority_flags & _PRIORITY_LOW:
+                priority = "low"
+            else:
                 priority = "medium"
-                if any(word in line.lower() for word in ['immediately', 'critical', 'urgent']):
-                    priority = "high"
-                elif any(word in line.lower() for word in ['consider', 'optional', 'if']):
-                    priority = "low"
-                
-                alerts.append({
-                    "type": alert_type,
-                    "message": line[:500],
-                    "priority": priority
-                })
+            
+            append({
+                "type": alert_type,
+                "message": line[:500],
+                "priority": priority
+            })
+            if len(alerts) >= _MAX_ALERTS:
+                break
         
         # Generate default alerts if none found
         if not alerts:
-            alerts = [
-                {
-                    "type": "recommendation",
-                    "message": "Monitor price action and volume for entry signals",
-                    "priority": "medium"
-                },
-                {
-                    "type": "risk_management",
-                    "message": "Set appropriate stop-loss levels based on volatility",
-                    "priority": "medium"
-                }
-            ]
+            return {
+                "alerts": [
+                    {"type": alert_type, "message": message, "priority": "medium"}
+                    for alert_type, message in _DEFAULT_ALERTS
+                ],
+                "recommendations": _DEFAULT_RECOMMENDATIONS,
+            }
         
         return {
-            "alerts": alerts[:5],
+            "alerts": alerts[:_MAX_ALERTS],
             "recommendations": " ".join([a["message"] for a in alerts[:3]])
         }
 
     # Include all the helper methods from the original orchestrator...
     def _format_agent_input(self, agent_name: str, input_data: Dict[str, Any]) -> str:
         """Format input data for agent."""
-        base_hypothesis = input_data.get('hypothesis', '')
-        
-        if agent_name == "hypothesis":
-            mode = input_data.get('mode', 'analyze')
-            return f"""Process this trading hypothesis in {mode} mode:
-
-"{base_hypothesis}"
-
-Please provide a clean, structured hypothesis statement."""
-            
-        elif agent_name == "context":
-            return f"""Analyze the context and extract structured information for this trading hypothesis:
-
-"{base_hypothesis}"
-
-Provide detailed JSON analysis including asset information, hypothesis parameters, research guidance, and risk factors."""
-            
-        elif agent_name == "research":
-            context = input_data.get('context', {})
-            asset_info = context.get('asset_info', {})
-            research_guidance = context.get('research_guidance', {})
-            
-            return f"""Conduct comprehensive research for this trading hypothesis:
-
-Hypothesis: "{base_hypothesis}"
-
-Asset Details:
-- Name: {asset_info.get('asset_name', 'Unknown')}
-- Symbol: {asset_info.get('primary_symbol', 'N/A')}
-- Type: {asset_info.get('asset_type', 'Unknown')}
-- Sector: {asset_info.get('sector', 'Unknown')}
-
-Research Focus:
-- Key metrics: {', '.join(research_guidance.get('key_metrics', ['price', 'volume']))}
-- Search terms: {', '.join(research_guidance.get('search_terms', ['market data']))}
-
-Use your available tools to gather market data and news information."""
-            
-        elif agent_name == "contradiction":
-            context = input_data.get('context', {})
-            research_summary = input_data.get('research_data', {}).get('summary', '')[:500]
-            
-            return f"""Identify contradictions and risk factors for this trading hypothesis:
-
-Hypothesis: "{base_hypothesis}"
-
-Asset Context: {context.get('asset_info', {}).get('asset_name', 'Unknown asset')}
-Research Summary: {research_summary}
-
-Find specific risks, challenges, and contradictory evidence that could invalidate this hypothesis."""
-            
-        elif agent_name == "synthesis":
-            context = input_data.get('context', {})
-            research_summary = input_data.get('research_data', {}).get('summary', '')[:500]
-            contradictions = input_data.get('contradictions', [])
-            
-            return f"""Synthesize a comprehensive investment analysis for this hypothesis:
-
-Hypothesis: "{base_hypothesis}"
-
-Asset: {context.get('asset_info', {}).get('asset_name', 'Unknown')}
-Research: {research_summary}
-Risk Factors: {len(contradictions)} identified
-
-Provide balanced analysis with supporting confirmations, confidence assessment, and investment recommendation."""
-            
-        elif agent_name == "alert":
-            confidence = input_data.get('confidence_score', 0.5)
-            contradictions_count = len(input_data.get('contradictions', []))
-            confirmations_count = len(input_data.get('confirmations', []))
-            synthesis = input_data.get('synthesis', {}).get('analysis', '')[:300]
-            
-            return f"""Generate actionable alerts and recommendations for this investment hypothesis:
-
-Hypothesis: "{base_hypothesis}"
-
-Analysis Summary:
-- Confidence Score: {confidence:.2f}
-- Risk Factors: {contradictions_count}
-- Supporting Factors: {confirmations_count}
-- Synthesis: {synthesis}
-
-Provide specific, actionable alerts with clear priorities and investment recommendations."""
-        
-        return str(input_data)
+        prompt_fields = _AGENT_PROMPT_FIELDS.get(agent_name)
+        if prompt_fields is None:
+            return str(input_data)
+        fields = {"hypothesis": input_data.get('hypothesis', ''), **prompt_fields(input_data)}
+        try:
+            return _render_agent_prompt(agent_name, tuple(fields.items()))
+        except TypeError:
+            # The LLM-written context can put lists or dicts in these fields, which cannot
+            # key the cache; render them uncached, as the template would show them
+            return _AGENT_PROMPT_TEMPLATES[agent_name].format_map(fields)
     
     def _extract_response(self, response: str) -> str:
         """Extract clean response text."""
@@ -890,20 +1668,7 @@ Provide specific, actionable alerts with clear priorities and investment recomme
         cleaned = response.strip()
         
         # Remove common prefixes
-        prefixes_to_remove = [
-            "Here's the processed hypothesis:",
-            "Here is the processed hypothesis:",
-            "Processed hypothesis:",
-            "The processed hypothesis is:",
-            "Analysis:",
-            "Response:",
-            "Output:",
-        ]
-        
-        for prefix in prefixes_to_remove:
-            if cleaned.lower().startswith(prefix.lower()):
-                cleaned = cleaned[len(prefix):].strip()
-                break
+        cleaned = _RESPONSE_PREFIX_RE.sub('', cleaned, count=1)
         
         # Remove quotes if the entire response is quoted
         if cleaned.startswith('"') and cleaned.endswith('"'):
@@ -915,124 +1680,55 @@ Provide specific, actionable alerts with clear priorities and investment recomme
         """Parse JSON response from agent."""
         if not response:
             return self._get_fallback_context()
+        response = response[:_MAX_PARSE_CHARS]
         
         try:
-            # Method 1: Direct JSON parsing if response starts with {
-            cleaned_response = response.strip()
-            if cleaned_response.startswith('{'):
-                return json.loads(cleaned_response)
-            
-            # Method 2: Extract JSON block
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                return json.loads(json_str)
+            # Method 1: The whole response is the object; decode it without scanning
+            stripped = response.strip()
+            if stripped.startswith('{') and stripped.endswith('}'):
+                try:
+                    return orjson.loads(stripped)
+                except orjson.JSONDecodeError:
+                    pass
             
-            # Method 3: Look for code block
-            code_block_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
-            if code_block_match:
-                json_str = code_block_match.group(1)
-                return json.loads(json_str)
+            # Method 2: First balanced object (code block, or prose with braces around
+            # the JSON); one linear scan instead of guessing a span and failing to parse
+            json_str = _extract_top_level_json(response)
+            if json_str:
+                return orjson.loads(json_str)
                 
-        except json.JSONDecodeError as e:
-            print(f"⚠️  JSON parsing failed: {str(e)}")
+        except orjson.JSONDecodeError as e:
+            logger.warning("⚠️  JSON parsing failed: %s", e)
         except Exception as e:
-            print(f"⚠️  Unexpected parsing error: {str(e)}")
+            logger.warning("⚠️  Unexpected parsing error: %s", e)
         
         # Try to extract partial information from text
         return self._extract_context_from_text(response)
     
     def _extract_context_from_text(self, response: str) -> Dict[str, Any]:
         """Extract context information from free text response."""
-        context = self._get_fallback_context()
+        # Look for asset mentions; the highest-priority mention decides the asset
+        mentioned = _mentioned_assets(response)
+        asset = next((name for name in _ASSET_PRIORITY if name in mentioned), None)
         
-        # Look for asset mentions
-        asset_patterns = [
-            r'(?:Apple|AAPL)',
-            r'(?:Tesla|TSLA)', 
-            r'(?:Bitcoin|BTC)',
-            r'(?:Microsoft|MSFT)',
-            r'(?:Google|GOOGL)',
-            r'(?:Amazon|AMZN)',
-            r'(?:Oil|Crude|WTI|Brent)',
-        ]
-        
-        for pattern in asset_patterns:
-            if re.search(pattern, response, re.IGNORECASE):
-                if 'Apple' in pattern or 'AAPL' in pattern:
-                    context["asset_info"] = {
-                        "primary_symbol": "AAPL",
-                        "asset_name": "Apple Inc.",
-                        "asset_type": "stock",
-                        "sector": "Technology",
-                        "market": "NASDAQ",
-                        "current_price": 195.64
-                    }
-                elif 'Tesla' in pattern or 'TSLA' in pattern:
-                    context["asset_info"] = {
-                        "primary_symbol": "TSLA", 
-                        "asset_name": "Tesla Inc.",
-                        "asset_type": "stock",
-                        "sector": "Automotive",
-                        "market": "NASDAQ",
-                        "current_price": 250.00
-                    }
-                elif 'Bitcoin' in pattern or 'BTC' in pattern:
-                    context["asset_info"] = {
-                        "primary_symbol": "BTC-USD",
-                        "asset_name": "Bitcoin",
-                        "asset_type": "cryptocurrency",
-                        "sector": "Cryptocurrency",
-                        "market": "Crypto",
-                        "current_price": 45000.00
-                    }
-                elif 'Oil' in pattern or 'Crude' in pattern:
-                    context["asset_info"] = {
-                        "primary_symbol": "CL=F",
-                        "asset_name": "Crude Oil",
-                        "asset_type": "commodity",
-                        "sector": "Energy",
-                        "market": "NYMEX",
-                        "current_price": 85.00
-                    }
-                break
+        asset_info = _ASSET_INFOS.get(asset)
+        if asset_info is None:
+            return self._get_fallback_context()
         
+        context = self._get_fallback_context()
+        context["asset_info"] = dict(asset_info)
         return context
     
     def _get_fallback_context(self) -> Dict[str, Any]:
         """Get fallback context."""
-        return {
-            "asset_info": {
-                "primary_symbol": "SPY",
-                "asset_name": "Financial Asset",
-                "asset_type": "equity",
-                "sector": "Technology",
-                "market": "NASDAQ",
-                "competitors": ["QQQ", "VTI"],
-                "current_price": 450.00
-            },
-            "hypothesis_details": {
-                "direction": "neutral",
-                "confidence_level": "medium",
-                "timeframe": "3-6 months",
-                "price_target": None
-            },
-            "research_guidance": {
-                "search_terms": ["market analysis", "financial data", "earnings"],
-                "key_metrics": ["price", "volume", "earnings", "revenue"],
-                "monitoring_events": ["earnings", "market news", "economic data"]
-            },
-            "risk_analysis": {
-                "primary_risks": ["market volatility", "economic uncertainty", "sector rotation"],
-                "contradiction_areas": ["valuation concerns", "competitive pressure"],
-                "sensitivity_factors": ["interest rates", "market sentiment"]
-            }
-        }
+        # A fresh mutable copy, decoded from bytes serialized once; ~10x faster than
+        # copy.deepcopy of the nested literal
+        return orjson.loads(_FALLBACK_CONTEXT_JSON)
 
 # Global orchestrator instance
 try:
     orchestrator = TradeSageOrchestrator()
-    print("🚀 TradeSage ADK Orchestrator (Clean Output Version) ready")
+    logger.info("🚀 TradeSage ADK Orchestrator (Clean Output Version) ready")
 except Exception as e:
-    print(f"❌ Failed to initialize TradeSage Orchestrator: {str(e)}")
+    logger.error("❌ Failed to initialize TradeSage Orchestrator: %s", e)
     orchestrator = None
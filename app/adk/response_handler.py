@@ -1,11 +1,25 @@
 # app/adk/response_handler.py - Enhanced response handling for ADK agents with function calls
-import json
+import orjson
+import reprlib
 from typing import Dict, Any, List, Optional
 from google.genai import types
 
+from app.utils.text_processor import truncate_text
+
+# Bounded repr for tool-result previews: nested payloads are elided while being
+# rendered instead of stringified in full and then cut
+_PREVIEW_REPR = reprlib.Repr()
+_PREVIEW_REPR.maxstring = 80
+_PREVIEW_REPR.maxother = 80
+
 class ADKResponseHandler:
     """Handle ADK agent responses including function calls and text parts."""
     
+    @staticmethod
+    def preview(value: Any, limit: int) -> str:
+        """Describe ``value`` in at most ``limit`` chars, appending "..." when cut."""
+        return truncate_text(value if isinstance(value, str) else _PREVIEW_REPR.repr(value), limit)
+    
     @staticmethod
     def extract_complete_response(events: List[Any]) -> Dict[str, Any]:
         """Extract complete response including both text and function call results."""
@@ -87,7 +101,7 @@ class ADKResponseHandler:
                 try:
                     # Try to parse as JSON if it's structured data
                     if isinstance(result, str) and result.startswith('{'):
-                        parsed_result = json.loads(result)
+                        parsed_result = orjson.loads(result)
                         formatted_sections.append(f"Status: {parsed_result.get('status', 'unknown')}")
                         
                         # Format market data
@@ -106,14 +120,10 @@ class ADKResponseHandler:
                     
                     else:
                         # Handle non-JSON results
-                        result_str = str(result)
-                        if len(result_str) > 200:
-                            formatted_sections.append(result_str[:200] + "...")
-                        else:
-                            formatted_sections.append(result_str)
+                        formatted_sections.append(ADKResponseHandler.preview(result, 200))
                             
                 except Exception as e:
-                    formatted_sections.append(f"Tool result (parsing failed): {str(result)[:100]}...")
+                    formatted_sections.append(f"Tool result (parsing failed): {ADKResponseHandler.preview(result, 100)}")
         
         # Add function call summary
         if response_data["function_calls"]:
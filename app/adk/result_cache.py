@@ -0,0 +1,95 @@
+# app/adk/result_cache.py - Restart-safe memoization of orchestrator results
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Any, Optional
+
+import orjson
+
+from app.config.adk_config import ADK_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Expired entries are swept from the cache directory at most this often, on the next write
+SWEEP_INTERVAL_SECONDS = 600
+
+class OrchestratorResultCache:
+    """Exact-match disk cache of ``process_hypothesis`` results.
+
+    Entries live at ``<cache_dir>/<key[:2]>/<key>`` where the key is the sha256 of the
+    hypothesis and mode. Expiry is based on file mtime, so no index has to be kept;
+    expired files are deleted when read and by a periodic sweep, since the directory
+    usually sits on memory-backed storage.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self._last_sweep = 0.0
+
+    @staticmethod
+    def make_key(hypothesis: str, mode: str) -> str:
+        return hashlib.sha256(f"{mode}\0{hypothesis}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, hypothesis: str, mode: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result, or None when missing, expired or unreadable."""
+        path = self._path(self.make_key(hypothesis, mode))
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.unlink(path)
+                return None
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("⚠️  Ignoring unreadable result cache entry %s: %s", path, e)
+            return None
+
+    def set(self, hypothesis: str, mode: str, result: Dict[str, Any]) -> None:
+        """Atomically write a result so concurrent readers never see a partial file."""
+        path = self._path(self.make_key(hypothesis, mode))
+        try:
+            data = orjson.dumps(result, default=str)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError) as e:
+            logger.warning("⚠️  Failed to write result cache entry: %s", e)
+
+        now = time.time()
+        if now - self._last_sweep >= SWEEP_INTERVAL_SECONDS:
+            self._last_sweep = now
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        """Delete expired entries, and temp files orphaned by an interrupted write."""
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if now - os.path.getmtime(path) > self.ttl_seconds:
+                        os.unlink(path)
+                        removed += 1
+                except OSError:
+                    continue  # removed concurrently, or not ours to delete
+        if removed:
+            logger.info("🧹 Removed %d expired result cache entries", removed)
+
+# Global cache instance
+result_cache = OrchestratorResultCache(
+    cache_dir=ADK_CONFIG["result_cache_dir"],
+    ttl_seconds=ADK_CONFIG["result_cache_ttl_seconds"],
+)
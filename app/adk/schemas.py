@@ -0,0 +1,15 @@
+# app/adk/schemas.py - Request/response models for the ADK API
+from pydantic import BaseModel, ConfigDict, Field
+
+class ProcessRequest(BaseModel):
+    """Body of POST /process."""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    hypothesis: str = Field(min_length=1)
+    mode: str = "analyze"
+
+class ProcessResponse(BaseModel):
+    """Returned by POST /process once the hypothesis has been queued."""
+    status: str = "accepted"
+    hypothesis_id: int
+    stream_url: str
@@ -1,6 +1,5 @@
 # app/adk/tools.py - Fixed Tools (No Default Parameters)
 from typing import Dict, Any, List
-import json
 from app.services.market_data_service import get_market_data
 from app.tools.news_data_tool import news_data_tool
 
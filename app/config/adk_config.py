@@ -8,6 +8,30 @@ ADK_CONFIG = {
     "location": os.getenv("REGION", "us-central1"),
     "model": "gemini-2.0-flash",
     "use_vertex_ai": True,
+    # Disk memo of full orchestrator results (point at fast local storage or tmpfs)
+    "result_cache_dir": os.getenv("RESULT_CACHE_DIR", "/tmp/tradesage_result_cache"),
+    "result_cache_ttl_seconds": int(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600")),
+    # Hypotheses left PROCESSING this long are failed at startup; must exceed the longest
+    # run so rows of live instances are not touched
+    "stale_processing_seconds": int(os.getenv("STALE_PROCESSING_SECONDS", "1800")),
+    # Per-agent response cache (exact prompt match, optional embedding-similarity tier)
+    "agent_cache_path": os.getenv("AGENT_CACHE_PATH", "/tmp/tradesage_agent_cache.sqlite3"),
+    "agent_cache_ttl_seconds": int(os.getenv("AGENT_CACHE_TTL_SECONDS", "3600")),
+    "agent_cache_context_ttl_seconds": int(os.getenv("AGENT_CACHE_CONTEXT_TTL_SECONDS", "86400")),
+    "agent_cache_semantic": os.getenv("AGENT_CACHE_SEMANTIC", "0") == "1",
+    "agent_cache_similarity_threshold": float(os.getenv("AGENT_CACHE_SIMILARITY_THRESHOLD", "0.97")),
+    "agent_cache_embedding_model": os.getenv("AGENT_CACHE_EMBEDDING_MODEL", "text-embedding-004"),
+    # Upper bound on in-flight agent LLM turns per worker (overall and per agent),
+    # and attempts on 429/503
+    "max_concurrent_llm_calls": int(os.getenv("MAX_CONCURRENT_LLM_CALLS", "8")),
+    "max_concurrent_per_agent": int(os.getenv("MAX_CONCURRENT_PER_AGENT", "4")),
+    "llm_max_attempts": int(os.getenv("LLM_MAX_ATTEMPTS", "4")),
+    # Wall-clock budget of one pipeline stage, retries included (0 disables)
+    "stage_timeout_seconds": float(os.getenv("STAGE_TIMEOUT_SECONDS", "300")),
+    # Connection pool of the shared LLM client (HTTP/2 multiplexes concurrent agent calls)
+    "llm_http2": os.getenv("LLM_HTTP2", "1") != "0",
+    "llm_max_connections": int(os.getenv("LLM_MAX_CONNECTIONS", "200")),
+    "llm_max_keepalive_connections": int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "100")),
 }
 
 # Agent Configuration
@@ -0,0 +1,40 @@
+# app/config/logging_config.py
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+def _private_stderr():
+    """Open a duplicate of the current fd 2, so logs keep flowing to the real stderr while
+    agent runs temporarily redirect fd 2 (see WarningSuppressionContext)."""
+    try:
+        sys.stderr.flush()
+        return os.fdopen(os.dup(2), "w", buffering=1, encoding="utf-8", errors="backslashreplace")
+    except (OSError, ValueError, AttributeError):
+        return sys.stderr
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route all log records through a queue so stream writes happen off the event loop.
+
+    Returns the started listener; the caller is responsible for stopping it on shutdown.
+    """
+    log_queue = queue.Queue(-1)
+
+    stream_handler = logging.StreamHandler(_private_stderr())
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    # Third-party loggers stay at the root level (ERROR); only our own code logs at LOG_LEVEL
+    logging.getLogger("app").setLevel(LOG_LEVEL)
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
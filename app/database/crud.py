@@ -1,9 +1,9 @@
 # app/database/crud.py
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from app.database.models import (
     TradingHypothesis, Contradiction, Confirmation, 
-    ResearchData, Alert, PriceHistory
+    ResearchData, Alert, PriceHistory, HypothesisStatus
 )
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
@@ -40,6 +40,19 @@ class HypothesisCRUD:
             db.refresh(db_hypothesis)
         return db_hypothesis
     
+    @staticmethod
+    def fail_stale_processing(db: Session, older_than: datetime) -> int:
+        """Mark hypotheses stuck in PROCESSING since before ``older_than`` as FAILED."""
+        count = db.query(TradingHypothesis).filter(
+            TradingHypothesis.status == HypothesisStatus.PROCESSING,
+            TradingHypothesis.updated_at < older_than,
+        ).update(
+            {"status": HypothesisStatus.FAILED, "updated_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.commit()
+        return count
+    
     @staticmethod
     def delete_hypothesis(db: Session, hypothesis_id: int) -> bool:
         """Delete a hypothesis."""
@@ -60,6 +73,12 @@ class ContradictionCRUD:
         db.refresh(db_contradiction)
         return db_contradiction
     
+    @staticmethod
+    def create_contradictions(db: Session, contradiction_rows: List[Dict[str, Any]]) -> None:
+        """Insert many contradictions in a single executemany and commit."""
+        db.bulk_insert_mappings(Contradiction, contradiction_rows)
+        db.commit()
+    
     @staticmethod
     def get_contradictions_by_hypothesis(db: Session, hypothesis_id: int) -> List[Contradiction]:
         """Get all contradictions for a hypothesis."""
@@ -75,6 +94,12 @@ class ConfirmationCRUD:
         db.refresh(db_confirmation)
         return db_confirmation
     
+    @staticmethod
+    def create_confirmations(db: Session, confirmation_rows: List[Dict[str, Any]]) -> None:
+        """Insert many confirmations in a single executemany and commit."""
+        db.bulk_insert_mappings(Confirmation, confirmation_rows)
+        db.commit()
+    
     @staticmethod
     def get_confirmations_by_hypothesis(db: Session, hypothesis_id: int) -> List[Confirmation]:
         """Get all confirmations for a hypothesis."""
@@ -105,6 +130,12 @@ class AlertCRUD:
         db.refresh(db_alert)
         return db_alert
     
+    @staticmethod
+    def create_alerts(db: Session, alert_rows: List[Dict[str, Any]]) -> None:
+        """Insert many alerts in a single executemany and commit."""
+        db.bulk_insert_mappings(Alert, alert_rows)
+        db.commit()
+    
     @staticmethod
     def get_alerts_by_hypothesis(db: Session, hypothesis_id: int) -> List[Alert]:
         """Get all alerts for a hypothesis."""
@@ -155,6 +186,14 @@ class PriceHistoryCRUD:
 
 # Aggregate methods for dashboard
 class DashboardCRUD:
+    @staticmethod
+    def get_dashboard_version(db: Session) -> str:
+        """Get a cheap token that changes whenever a hypothesis is added, updated or removed."""
+        last_updated, count = db.query(
+            func.max(TradingHypothesis.updated_at), func.count(TradingHypothesis.id)
+        ).one()
+        return f"{last_updated.isoformat() if last_updated else 'empty'}-{count}"
+    
     @staticmethod
     def get_hypothesis_summary(db: Session, hypothesis_id: int) -> Dict[str, Any]:
         """Get complete hypothesis summary with counts and data."""
@@ -2,6 +2,7 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 from enum import Enum
@@ -17,6 +18,8 @@ class HypothesisStatus(str, Enum):
     ON_DEMAND = "on_demand"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+    PROCESSING = "processing"
+    FAILED = "failed"
 
 class TradingHypothesis(Base):
     __tablename__ = "hypotheses"
@@ -33,7 +36,7 @@ class TradingHypothesis(Base):
     timeframe = Column(String(100))
     success_criteria = Column(Text)
     risk_factors = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, server_default=func.now(), index=True)  # Set by the database on insert
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     last_analysis_at = Column(DateTime, index=True)
     
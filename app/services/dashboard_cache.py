@@ -0,0 +1,77 @@
+# app/services/dashboard_cache.py - Short-lived cache for the serialized dashboard payload
+import logging
+import os
+import time
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+DASHBOARD_CACHE_TTL_SECONDS = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "10"))
+DASHBOARD_CACHE_KEY = "tradesage:dashboard"
+
+class DashboardCache:
+    """Cache the dashboard body together with the table version it was built from.
+
+    Uses Redis when REDIS_URL is set so all workers share one snapshot; otherwise falls
+    back to a per-process entry. Either way entries expire after ``ttl_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: int = DASHBOARD_CACHE_TTL_SECONDS, redis_url: Optional[str] = REDIS_URL):
+        self.ttl_seconds = ttl_seconds
+        self._redis = None
+        self._local: Optional[Tuple[float, str, bytes]] = None
+
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning("⚠️  Redis unavailable for dashboard cache, using in-process cache: %s", e)
+
+    async def get(self, version: str) -> Optional[bytes]:
+        """Return the cached body if it was built from ``version`` and has not expired."""
+        if self._redis is not None:
+            try:
+                cached_version, body = await self._redis.hmget(DASHBOARD_CACHE_KEY, "version", "body")
+                if cached_version is not None and cached_version.decode() == version:
+                    return body
+                return None
+            except Exception as e:
+                logger.warning("⚠️  Dashboard cache read failed: %s", e)
+                return None
+
+        if self._local is not None:
+            expires_at, cached_version, body = self._local
+            if cached_version == version and time.monotonic() < expires_at:
+                return body
+        return None
+
+    async def set(self, version: str, body: bytes) -> None:
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(DASHBOARD_CACHE_KEY, mapping={"version": version, "body": body})
+                    pipe.expire(DASHBOARD_CACHE_KEY, self.ttl_seconds)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning("⚠️  Dashboard cache write failed: %s", e)
+            return
+
+        self._local = (time.monotonic() + self.ttl_seconds, version, body)
+
+    async def invalidate(self) -> None:
+        """Drop the cached snapshot after hypothesis data changes."""
+        self._local = None
+        if self._redis is not None:
+            try:
+                await self._redis.delete(DASHBOARD_CACHE_KEY)
+            except Exception as e:
+                logger.warning("⚠️  Dashboard cache invalidation failed: %s", e)
+
+    async def aclose(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+# Global cache instance
+dashboard_cache = DashboardCache()
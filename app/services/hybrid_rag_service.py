@@ -1,12 +1,13 @@
 # app/services/hybrid_rag_service.py - Fixed for FastAPI compatibility
 import asyncio
-import json
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import vertexai
 from vertexai.language_models import TextEmbeddingModel
 
+from app.utils.text_processor import truncate_text
+
 # Configuration
 PROJECT_ID = "tradesage-mvp"
 REGION = "us-central1"
@@ -172,7 +173,7 @@ class HybridRAGService:
                 
                 historical_insights.append({
                     "title": title,
-                    "content_preview": content[:300] + "..." if len(content) > 300 else content,
+                    "content_preview": truncate_text(content, 300),
                     "full_content": content,
                     "instrument": instrument,
                     "source": source_type,
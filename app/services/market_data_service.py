@@ -1,11 +1,16 @@
 # app/services/market_data_service.py - Real data only, no mock fallbacks
 
+import logging
 import requests
 import os
 import time
-import json
+import orjson
 from datetime import datetime, timedelta
 
+from app.utils.http_session import vendor_session
+
+logger = logging.getLogger(__name__)
+
 class MarketDataService:
     def __init__(self):
         # Load API keys from environment
@@ -16,12 +21,14 @@ class MarketDataService:
         self._cache = {}
         self._cache_duration = 300  # 5 minutes
         
-        print("Market data service initialized with:")
-        print(f"- Alpha Vantage API key: {'Available' if self.alpha_vantage_key else 'Not found'}")
-        print(f"- FMP API key: {'Available' if self.fmp_key else 'Not found'}")
+        logger.info(
+            "Market data service initialized with: Alpha Vantage API key %s, FMP API key %s",
+            "available" if self.alpha_vantage_key else "not found",
+            "available" if self.fmp_key else "not found",
+        )
         
         if not self.alpha_vantage_key and not self.fmp_key:
-            print("⚠️  WARNING: No API keys found. Market data will be limited to Yahoo Finance scraping.")
+            logger.warning("⚠️  No API keys found. Market data will be limited to Yahoo Finance scraping.")
     
     def get_stock_data(self, symbol):
         """Main method to fetch stock data - real data only, no mocks"""
@@ -39,7 +46,7 @@ class MarketDataService:
         # Check cache first
         cache_key = f"{symbol}_{int(time.time() // self._cache_duration)}"
         if cache_key in self._cache:
-            print(f"✅ Using cached data for {symbol}")
+            logger.debug("✅ Using cached data for %s", symbol)
             return self._cache[cache_key]
         
         errors = []
@@ -47,39 +54,39 @@ class MarketDataService:
         # Try Alpha Vantage first (if key is available)
         if self.alpha_vantage_key:
             try:
-                print(f"🔍 Fetching {symbol} from Alpha Vantage...")
+                logger.debug("🔍 Fetching %s from Alpha Vantage...", symbol)
                 data = self._fetch_alpha_vantage(symbol)
                 self._cache[cache_key] = data
-                print(f"✅ Successfully fetched {symbol} from Alpha Vantage: ${data['data']['info']['currentPrice']}")
+                logger.debug("✅ Successfully fetched %s from Alpha Vantage: $%s", symbol, data['data']['info']['currentPrice'])
                 return data
             except Exception as e:
                 error_msg = f"Alpha Vantage failed: {str(e)}"
-                print(f"❌ {error_msg}")
+                logger.warning("❌ %s", error_msg)
                 errors.append(error_msg)
         
         # Try FMP next (if key is available)
         if self.fmp_key:
             try:
-                print(f"🔍 Fetching {symbol} from Financial Modeling Prep...")
+                logger.debug("🔍 Fetching %s from Financial Modeling Prep...", symbol)
                 data = self._fetch_fmp(symbol)
                 self._cache[cache_key] = data
-                print(f"✅ Successfully fetched {symbol} from FMP: ${data['data']['info']['currentPrice']}")
+                logger.debug("✅ Successfully fetched %s from FMP: $%s", symbol, data['data']['info']['currentPrice'])
                 return data
             except Exception as e:
                 error_msg = f"FMP failed: {str(e)}"
-                print(f"❌ {error_msg}")
+                logger.warning("❌ %s", error_msg)
                 errors.append(error_msg)
         
         # Try Yahoo Finance as last resort
         try:
-            print(f"🔍 Fetching {symbol} from Yahoo Finance (scraping)...")
+            logger.debug("🔍 Fetching %s from Yahoo Finance (scraping)...", symbol)
             data = self._fetch_yahoo(symbol)
             self._cache[cache_key] = data
-            print(f"✅ Successfully fetched {symbol} from Yahoo Finance: ${data['data']['info']['currentPrice']}")
+            logger.debug("✅ Successfully fetched %s from Yahoo Finance: $%s", symbol, data['data']['info']['currentPrice'])
             return data
         except Exception as e:
             error_msg = f"Yahoo Finance failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.warning("❌ %s", error_msg)
             errors.append(error_msg)
         
         # If all methods fail, return error
@@ -98,7 +105,7 @@ class MarketDataService:
             ]
         }
         
-        print(f"❌ Failed to fetch data for {symbol}: {all_errors}")
+        logger.error("❌ Failed to fetch data for %s: %s", symbol, all_errors)
         return error_response
     
     def _fetch_alpha_vantage(self, symbol):
@@ -110,10 +117,10 @@ class MarketDataService:
         }
         
         url = "https://www.alphavantage.co/query"
-        response = requests.get(url, params=params, timeout=15)
+        response = vendor_session.get(url, params=params, timeout=15)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Check for API errors
         if 'Error Message' in data:
@@ -168,10 +175,10 @@ class MarketDataService:
         url = f"https://financialmodelingprep.com/api/v3/quote/{symbol}"
         params = {'apikey': self.fmp_key}
         
-        response = requests.get(url, params=params, timeout=15)
+        response = vendor_session.get(url, params=params, timeout=15)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if not data or len(data) == 0:
             raise Exception("No data returned. Symbol may be invalid.")
@@ -233,7 +240,7 @@ class MarketDataService:
         
         try:
             url = f"https://finance.yahoo.com/quote/{yahoo_symbol}"
-            response = requests.get(url, headers=headers, timeout=15)
+            response = vendor_session.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             
             # Check if page indicates invalid symbol
@@ -266,7 +273,7 @@ class MarketDataService:
                 name_element = soup.find('h1', {'data-reactid': '7'})
                 if name_element:
                     name = name_element.get_text().split('(')[0].strip()
-            except:
+            except AttributeError:
                 pass
             
             # Extract previous close and calculate change
@@ -288,7 +295,7 @@ class MarketDataService:
                                 change = price - prev_close
                                 change_percent = (change / prev_close * 100) if prev_close != 0 else 0
                                 break
-            except:
+            except (ValueError, AttributeError):
                 pass  # Use defaults
             
             # Determine sector (simplified)
@@ -365,7 +372,7 @@ class MarketDataService:
     def clear_cache(self):
         """Clear the cache - useful for testing"""
         self._cache.clear()
-        print("Market data cache cleared")
+        logger.info("Market data cache cleared")
     
     def get_cache_info(self):
         """Get information about cached data"""
@@ -1,5 +1,9 @@
+import logging
+
 from app.services.market_data_service import get_market_data
 
+logger = logging.getLogger(__name__)
+
 def market_data_tool(instrument, source="auto", project_id="tradesage-mvp"):
     """
     Tool for retrieving market data with fallbacks and mock data
@@ -25,5 +29,5 @@ def get_secret(secret_name, project_id):
         response = client.access_secret_version(name=name)
         return response.payload.data.decode("UTF-8")
     except Exception as e:
-        print(f"Error retrieving secret {secret_name}: {e}")
+        logger.error("Error retrieving secret %s: %s", secret_name, e)
         return None
@@ -1,9 +1,13 @@
 # app/tools/news_data_tool.py
-import requests
+import logging
 from google.cloud import secretmanager
-import json
+import orjson
 from datetime import datetime, timedelta
 
+from app.utils.http_session import vendor_session
+
+logger = logging.getLogger(__name__)
+
 def get_secret(secret_name, project_id):
     """Retrieve secret from Secret Manager."""
     try:
@@ -12,7 +16,7 @@ def get_secret(secret_name, project_id):
         response = client.access_secret_version(name=name)
         return response.payload.data.decode("UTF-8")
     except Exception as e:
-        print(f"Error retrieving secret {secret_name}: {e}")
+        logger.error("Error retrieving secret %s: %s", secret_name, e)
         return None
 
 def news_data_tool(query, days=7, project_id="tradesage-mvp"):
@@ -25,9 +29,9 @@ def news_data_tool(query, days=7, project_id="tradesage-mvp"):
             
         url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&topics={query}&apikey={api_key}"
         
-        response = requests.get(url)
+        response = vendor_session.get(url, timeout=15)
         response.raise_for_status()
-        av_data = response.json()
+        av_data = orjson.loads(response.content)
         
         # Filter for recent news only
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
@@ -0,0 +1,17 @@
+# app/utils/http_session.py - Pooled HTTP session shared by vendor API calls
+import requests
+from requests.adapters import HTTPAdapter
+
+VENDOR_POOL_CONNECTIONS = 8
+VENDOR_POOL_MAXSIZE = 32
+
+def _build_session() -> requests.Session:
+    """Build a session whose connection pools keep TLS connections to vendor hosts alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=VENDOR_POOL_CONNECTIONS, pool_maxsize=VENDOR_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# Global session instance
+vendor_session = _build_session()
@@ -0,0 +1,115 @@
+# app/utils/profiling.py - Lightweight await-time instrumentation for the request path
+import functools
+import logging
+import os
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Deque, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE = os.getenv("PROFILE", "").lower()
+TIMING_RING_SIZE = int(os.getenv("TIMING_RING_SIZE", "512"))
+HISTOGRAM_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+class AwaitTimings:
+    """Keep the last ``ring_size`` durations of each labelled await in memory."""
+
+    def __init__(self, ring_size: int = TIMING_RING_SIZE):
+        self.ring_size = ring_size
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, label: str, seconds: float) -> None:
+        samples = self._samples.get(label)
+        if samples is None:
+            samples = self._samples[label] = deque(maxlen=self.ring_size)
+        samples.append(seconds * 1000)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize each label as count, percentiles and a non-cumulative histogram in ms."""
+        summary = {}
+        for label, samples in self._samples.items():
+            values = sorted(samples)
+            if not values:
+                continue
+
+            histogram = {f"<={bound}": 0 for bound in HISTOGRAM_BUCKETS_MS}
+            histogram["inf"] = 0
+            for value in values:
+                for bound in HISTOGRAM_BUCKETS_MS:
+                    if value <= bound:
+                        histogram[f"<={bound}"] += 1
+                        break
+                else:
+                    histogram["inf"] += 1
+
+            summary[label] = {
+                "count": len(values),
+                "mean_ms": round(statistics.fmean(values), 2),
+                "p50_ms": round(values[len(values) // 2], 2),
+                "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 2),
+                "max_ms": round(values[-1], 2),
+                "histogram_ms": histogram,
+            }
+        return summary
+
+# Global timings instance
+await_timings = AwaitTimings()
+
+def _trace_event(label: str):
+    """Return a viztracer event context when viztracer is the active tracer."""
+    if PROFILE != "viztracer":
+        return nullcontext()
+    try:
+        from viztracer import get_tracer
+    except ImportError:
+        return nullcontext()
+    tracer = get_tracer()
+    return tracer.log_event(label) if tracer is not None else nullcontext()
+
+@asynccontextmanager
+async def timed_await(label: str) -> AsyncIterator[None]:
+    """Attribute the wall time of the wrapped await(s) to ``label``."""
+    start = time.perf_counter()
+    try:
+        with _trace_event(label):
+            yield
+    finally:
+        await_timings.record(label, time.perf_counter() - start)
+
+def timed(label: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator recording the total wall time of an async function under ``label``."""
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            async with timed_await(label):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def start_profiler() -> None:
+    """Start an optional whole-process profiler selected by the PROFILE env var.
+
+    ``PROFILE=1`` / ``scalene`` starts Scalene (run the app under ``scalene --async``);
+    ``PROFILE=viztracer`` only enables ``log_event`` spans for a tracer started by the
+    ``viztracer`` launcher. Neither package is a runtime dependency.
+    """
+    if PROFILE in ("1", "true", "scalene"):
+        try:
+            from scalene import scalene_profiler
+            scalene_profiler.Scalene.start()
+            logger.info("📈 Scalene profiling started")
+        except Exception as e:
+            logger.warning("⚠️  PROFILE set but Scalene could not be started: %s", e)
+
+def stop_profiler() -> None:
+    if PROFILE in ("1", "true", "scalene"):
+        try:
+            from scalene import scalene_profiler
+            scalene_profiler.Scalene.stop()
+        except Exception as e:
+            logger.warning("⚠️  Failed to stop Scalene: %s", e)
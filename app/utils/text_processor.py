@@ -1,9 +1,57 @@
 # app/utils/text_processor.py - Enhanced version with better contradiction processing
 
 import re
-import json
+import orjson
 from typing import List, Dict, Any
 
+# Patterns compiled once at import; these run per line/section of every agent response
+_EMPHASIS_RE = re.compile(r'\*+')
+_HEADING_RE = re.compile(r'#+\s*')
+_THESIS_LABEL_RE = re.compile(r'Thesis Statement[s]?[:]?\s*')
+_HYPOTHESIS_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'([^:\n]+will\s+reach\s+[^.]+)',
+    r'([^:\n]+will\s+appreciate\s+[^.]+)',
+    r'([^:\n]+will\s+increase\s+[^.]+)',
+    r'([^:\n]+will\s+go\s+above\s+[^.]+)',
+    r'([^:\n]+will\s+rise\s+[^.]+)',
+    r'([^:\n]+oil\s+prices?[^.]+)',
+    r'([^:\n]+crude\s+oil[^.]+)',
+    r'(WTI[^.]+)',
+    r'(West\s+Texas\s+Intermediate[^.]+)',
+    r'(Bitcoin[^.]+)',
+))
+_PRICE_RE = re.compile(r'\$\d+')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s')
+_URL_RE = re.compile(r'https?://[^\s]+')
+_HTTP_URL_RE = re.compile(r'http://[^\s]+')
+_IMAGE_REF_RE = re.compile(r'\(https://images\.[^\)]+\)')
+_TECHNICAL_METADATA_RES = (
+    re.compile(r'aapl-\d+'),
+    re.compile(r'PIY PIY PIY'),
+    re.compile(r'--\d+-\d+'),
+    re.compile(r'http://fasb\.org[^\s]*'),
+)
+_GARBAGE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'https?://',  # URLs
+    r'aapl-\d{8}',  # Technical file names
+    r'PIY\s+PIY\s+PIY',  # Repeated technical codes
+    r'fasb\.org',  # Technical documentation references
+    r'^\[\]$',  # Empty brackets
+    r'^""\s*$',  # Empty quotes
+    r'images\.cointelegraph\.com',  # Image URLs
+))
+_TECHNICAL_CHAR_RE = re.compile(r'[^\w\s]')
+_SECTION_SPLIT_RE = re.compile(r'\n(?=\d+[\.\)]\s+|\*\s+|\-\s+)')
+_SECTION_MARKER_RES = (
+    re.compile(r'^\d+[\.\)]\s*'),
+    re.compile(r'^\*\s*'),
+    re.compile(r'^\-\s*'),
+)
+
+def truncate_text(text: str, limit: int) -> str:
+    """Return ``text`` cut to ``limit`` chars with "..." appended when it was longer."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
 class ResponseProcessor:
     @staticmethod
     def clean_hypothesis_title(raw_title):
@@ -16,38 +64,25 @@ class ResponseProcessor:
             return raw_title
         
         # Remove markup and formatting
-        cleaned = re.sub(r'\*+', '', raw_title)
-        cleaned = re.sub(r'#+\s*', '', cleaned)
-        cleaned = re.sub(r'Thesis Statement[s]?[:]?\s*', '', cleaned)
+        cleaned = _EMPHASIS_RE.sub('', raw_title)
+        cleaned = _HEADING_RE.sub('', cleaned)
+        cleaned = _THESIS_LABEL_RE.sub('', cleaned)
         
         # Extract just the hypothesis statement
-        patterns = [
-            r'([^:\n]+will\s+reach\s+[^.]+)',
-            r'([^:\n]+will\s+appreciate\s+[^.]+)',
-            r'([^:\n]+will\s+increase\s+[^.]+)',
-            r'([^:\n]+will\s+go\s+above\s+[^.]+)',
-            r'([^:\n]+will\s+rise\s+[^.]+)',
-            r'([^:\n]+oil\s+prices?[^.]+)',
-            r'([^:\n]+crude\s+oil[^.]+)',
-            r'(WTI[^.]+)',
-            r'(West\s+Texas\s+Intermediate[^.]+)',
-            r'(Bitcoin[^.]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, cleaned, re.IGNORECASE)
+        for pattern in _HYPOTHESIS_PATTERNS:
+            match = pattern.search(cleaned)
             if match:
                 return match.group(1).strip()
         
         # If input contains "oil" and a price, use a more generic extraction
-        if "oil" in cleaned.lower() and re.search(r'\$\d+', cleaned):
-            sentences = re.split(r'[.!?]\s', cleaned)
+        if "oil" in cleaned.lower() and _PRICE_RE.search(cleaned):
+            sentences = _SENTENCE_SPLIT_RE.split(cleaned)
             for sentence in sentences:
-                if "oil" in sentence.lower() and re.search(r'\$\d+', sentence):
+                if "oil" in sentence.lower() and _PRICE_RE.search(sentence):
                     return sentence.strip()
         
         # Default to first sentence if no pattern matches
-        sentences = re.split(r'[.!?]\s', cleaned)
+        sentences = _SENTENCE_SPLIT_RE.split(cleaned)
         return sentences[0].strip()
     
     @staticmethod
@@ -69,9 +104,10 @@ class ResponseProcessor:
                 return contradictions
         
         # Try parsing as JSON if it looks like JSON
-        if raw_text.strip().startswith('[') and raw_text.strip().endswith(']'):
+        stripped = raw_text.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
             try:
-                parsed = json.loads(raw_text)
+                parsed = orjson.loads(raw_text)
                 if isinstance(parsed, list):
                     for item in parsed:
                         if isinstance(item, dict) and "quote" in item and "reason" in item:
@@ -80,8 +116,8 @@ class ResponseProcessor:
                                 contradictions.append(cleaned_item)
                     if contradictions:
                         return contradictions
-            except:
-                pass  # Not valid JSON, continue with text processing
+            except (orjson.JSONDecodeError, TypeError, AttributeError):
+                pass  # Not valid JSON or non-text fields, continue with text processing
         
         # Parse text-based contradictions
         contradictions = ResponseProcessor._parse_text_contradictions(raw_text)
@@ -121,17 +157,15 @@ class ResponseProcessor:
             return ""
         
         # Remove URLs
-        text = re.sub(r'https?://[^\s]+', '', text)
-        text = re.sub(r'http://[^\s]+', '', text)
+        text = _URL_RE.sub('', text)
+        text = _HTTP_URL_RE.sub('', text)
         
         # Remove image references
-        text = re.sub(r'\(https://images\.[^\)]+\)', '', text)
+        text = _IMAGE_REF_RE.sub('', text)
         
         # Remove technical metadata
-        text = re.sub(r'aapl-\d+', '', text)
-        text = re.sub(r'PIY PIY PIY', '', text)
-        text = re.sub(r'--\d+-\d+', '', text)
-        text = re.sub(r'http://fasb\.org[^\s]*', '', text)
+        for pattern in _TECHNICAL_METADATA_RES:
+            text = pattern.sub('', text)
         
         # Remove excessive whitespace and cleanup
         text = ' '.join(text.split())
@@ -152,8 +186,8 @@ class ResponseProcessor:
             return "Market analysis challenges this thesis"
         
         # Remove URLs and technical data
-        text = re.sub(r'https?://[^\s]+', '', text)
-        text = re.sub(r'http://[^\s]+', '', text)
+        text = _URL_RE.sub('', text)
+        text = _HTTP_URL_RE.sub('', text)
         
         # Clean up and return
         text = ' '.join(text.split())
@@ -170,22 +204,12 @@ class ResponseProcessor:
             return True
         
         # Check for patterns that indicate technical garbage
-        garbage_patterns = [
-            r'https?://',  # URLs
-            r'aapl-\d{8}',  # Technical file names
-            r'PIY\s+PIY\s+PIY',  # Repeated technical codes
-            r'fasb\.org',  # Technical documentation references
-            r'^\[\]$',  # Empty brackets
-            r'^""\s*$',  # Empty quotes
-            r'images\.cointelegraph\.com',  # Image URLs
-        ]
-        
-        for pattern in garbage_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in _GARBAGE_PATTERNS:
+            if pattern.search(text):
                 return True
         
         # Check if text is mostly technical characters
-        technical_chars = len(re.findall(r'[^\w\s]', text))
+        technical_chars = len(_TECHNICAL_CHAR_RE.findall(text))
         total_chars = len(text)
         
         if total_chars > 0 and technical_chars / total_chars > 0.3:
@@ -199,7 +223,7 @@ class ResponseProcessor:
         contradictions = []
         
         # Split by common patterns
-        sections = re.split(r'\n(?=\d+[\.\)]\s+|\*\s+|\-\s+)', raw_text)
+        sections = _SECTION_SPLIT_RE.split(raw_text)
         
         for section in sections:
             cleaned = section.strip()
@@ -207,9 +231,8 @@ class ResponseProcessor:
                 continue
                 
             # Remove numbering
-            cleaned = re.sub(r'^\d+[\.\)]\s*', '', cleaned)
-            cleaned = re.sub(r'^\*\s*', '', cleaned)
-            cleaned = re.sub(r'^\-\s*', '', cleaned)
+            for pattern in _SECTION_MARKER_RES:
+                cleaned = pattern.sub('', cleaned)
             
             # Clean the text
             quote = ResponseProcessor._clean_quote_text(cleaned)
@@ -292,6 +315,6 @@ class ResponseProcessor:
             return ResponseProcessor.extract_confirmations(response_text)
         else:
             # General cleaning
-            cleaned = re.sub(r'\*+', '', response_text)
-            cleaned = re.sub(r'#+\s*', '', cleaned)
+            cleaned = _EMPHASIS_RE.sub('', response_text)
+            cleaned = _HEADING_RE.sub('', cleaned)
             return cleaned.strip()
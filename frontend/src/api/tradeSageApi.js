@@ -16,13 +16,44 @@ class TradeSageAPI {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
       
-      return await response.json();
+      const accepted = await response.json();
+      if (accepted.status !== 'accepted') {
+        return accepted;
+      }
+      
+      // Processing runs in the background; wait for the final result on the progress stream
+      return await this.waitForHypothesis(accepted.hypothesis_id);
     } catch (error) {
       console.error('Error processing hypothesis:', error);
       throw error;
     }
   }
   
+  waitForHypothesis(hypothesisId, onProgress) {
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${API_BASE_URL}/process/${hypothesisId}/stream`);
+      
+      source.addEventListener('complete', (event) => {
+        source.close();
+        const data = JSON.parse(event.data);
+        resolve(data.result || { status: 'success', hypothesis_id: hypothesisId });
+      });
+      source.addEventListener('failed', (event) => {
+        source.close();
+        const data = JSON.parse(event.data);
+        resolve({ status: 'error', hypothesis_id: hypothesisId, error: data.error });
+      });
+      // 'processing' is sent while another instance runs the analysis
+      ['queued', 'processing', 'cached', 'coalesced', 'hypothesis', 'context', 'research', 'contradiction', 'synthesis', 'alert', 'saving'].forEach((state) => {
+        source.addEventListener(state, () => onProgress && onProgress(state));
+      });
+      source.onerror = () => {
+        source.close();
+        reject(new Error('Lost connection to hypothesis progress stream'));
+      };
+    });
+  }
+  
   async generateHypothesis(context) {
     return this.processHypothesis({
       mode: 'generate',
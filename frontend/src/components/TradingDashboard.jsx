@@ -97,7 +97,9 @@ const TradingDashboard = () => {
       'on demand': 'bg-blue-500 text-white',
       'active': 'bg-purple-500 text-white',
       'completed': 'bg-green-500 text-white',
-      'cancelled': 'bg-red-500 text-white'
+      'cancelled': 'bg-red-500 text-white',
+      'processing': 'bg-amber-500 text-white',
+      'failed': 'bg-red-700 text-white'
     };
     return statusColors[status.toLowerCase()] || 'bg-gray-500 text-white';
   };
@@ -91,6 +91,14 @@ def init_cloudsql_tables():
         
         print("✅ Performance indexes created")
         
+        # Column defaults the application relies on (create_all does not alter existing tables)
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("ALTER TABLE hypotheses ALTER COLUMN created_at SET DEFAULT now();"))
+                conn.commit()
+            except Exception as e:
+                print(f"⚠️ Column default warning: {e}")
+        
         # Create a function to check if RAG tables exist (for integration)
         print("🔍 Checking for RAG tables...")
         with engine.connect() as conn: